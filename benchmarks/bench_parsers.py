@@ -0,0 +1,71 @@
+"""
+Compara os backends de análise da página de anúncios (core/parsers.py) sobre
+uma página salva em benchmarks/fixtures.
+
+Uso (na raiz do projeto):
+    python benchmarks/bench_parsers.py [--limit 10] [--repeat 30] [--fixture caminho.html]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.parsers import BACKENDS, available_backends  # noqa: E402
+
+
+def parse_full_page(text: str, limit: int) -> list:
+    """Implementação anterior: BeautifulSoup sobre o documento inteiro + select()"""
+    from bs4 import BeautifulSoup
+    from core.parsers import build_update
+
+    soup = BeautifulSoup(text, "html.parser")
+    updates = []
+    for item in soup.select(".announcement-item")[:limit]:
+        title = item.select_one(".announcement-title")
+        desc = item.select_one(".announcement-description")
+        date = item.select_one(".announcement-date")
+        updates.append(build_update(
+            title.text if title else None, desc.text if desc else None, date.text if date else None
+        ))
+    return updates
+
+
+def bench(fn, text: str, limit: int, repeat: int) -> list:
+    fn(text, limit)  # aquecimento (imports preguiçosos)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text, limit)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", default=os.path.join(ROOT, "benchmarks", "fixtures", "announcements.html"))
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as f:
+        text = f.read()
+
+    candidates = [("bs4 (documento inteiro)", parse_full_page)]
+    candidates += [(name, BACKENDS[name][1]) for name in available_backends()]
+
+    expected = [u["title"] for u in parse_full_page(text, args.limit)]
+    print(f"Página: {args.fixture} ({len(text) / 1024:.0f} KiB), limit={args.limit}, repeat={args.repeat}\n")
+    print(f"{'backend':<26}{'mediana':>10}{'p95':>10}{'mínimo':>10}   resultado")
+    for name, fn in candidates:
+        times = sorted(bench(fn, text, args.limit, args.repeat))
+        ok = [u["title"] for u in fn(text, args.limit)] == expected
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))]
+        print(f"{name:<26}{statistics.median(times):>8.2f}ms{p95:>8.2f}ms{times[0]:>8.2f}ms   {'ok' if ok else 'DIVERGENTE'}")
+
+
+if __name__ == "__main__":
+    main()
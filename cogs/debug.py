@@ -0,0 +1,146 @@
+import gc
+import resource
+
+import discord
+from discord.ext import commands
+from discord import Embed, app_commands
+from datetime import datetime
+
+from utils import format_datetime_br, BR_TZ
+
+
+def clip(text: str, limit: int = 1024) -> str:
+    return text if len(text) <= limit else text[:limit - 4] + "\n…"
+
+
+def process_rss_mb():
+    """(RSS atual, pico de RSS) do processo em MB; o atual vem do /proc (Linux)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KB no Linux
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024, peak
+    except OSError:
+        pass
+    return None, peak
+
+
+class DebugCog(commands.Cog):
+    debug = app_commands.Group(name="debug", description="Diagnóstico do bot (apenas para o dono)")
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if await self.bot.is_owner(interaction.user):
+            return True
+        await interaction.response.send_message("❌ Comando restrito ao dono do bot.", ephemeral=True)
+        return False
+
+    def build_perf_embed(self, summary):
+        lag = summary["lag"]
+        embed = Embed(
+            title="🔬 Desempenho do event loop",
+            description=f"Desde {format_datetime_br(datetime.fromtimestamp(summary['since'], BR_TZ))}",
+            color=0x5865F2
+        )
+        embed.add_field(
+            name="Atraso do loop (1h) p50 / p95 / p99",
+            value=" / ".join(f"{lag[k]:.0f}ms" if lag[k] is not None else "--" for k in ("p50", "p95", "p99")),
+            inline=True
+        )
+        embed.add_field(name="Maior atraso", value=f"{summary['max_lag'] * 1000:.0f}ms", inline=True)
+
+        callbacks = "\n".join(
+            f"`{total:.2f}s` em {count}x (pior {worst * 1000:.0f}ms) — {name}"
+            for name, (count, total, worst) in summary["slow_callbacks"]
+        )
+        embed.add_field(name="Callbacks lentos", value=clip(callbacks or "Nenhum registrado."), inline=False)
+
+        for frames, (samples, worst) in summary["stacks"][:3]:
+            embed.add_field(
+                name=f"Pilha bloqueando o loop ({samples} amostra(s), pior {worst * 1000:.0f}ms)",
+                value=clip("```\n" + "\n".join(frames) + "\n```"),
+                inline=False
+            )
+        if not summary["stacks"]:
+            embed.add_field(name="Pilhas bloqueando o loop", value="Nenhuma amostra.", inline=False)
+        return embed
+
+    @debug.command(name="perf", description="Resume atraso do event loop e os callbacks mais lentos")
+    async def perf(self, interaction: discord.Interaction):
+        profiler = getattr(self.bot, "profiler", None)
+        if profiler is None:
+            await interaction.response.send_message(
+                "⚠️ Profiling desativado. Inicie o bot com `PROFILE=1` para coletar dados.", ephemeral=True
+            )
+            return
+        await interaction.response.send_message(embed=self.build_perf_embed(profiler.summary()), ephemeral=True)
+
+    def build_memory_embed(self):
+        bot = self.bot
+        guilds = bot.guilds
+        embed = Embed(title="🧠 Memória e caches", color=0x5865F2)
+
+        rss, peak = process_rss_mb()
+        embed.add_field(
+            name="Processo",
+            value=(
+                f"RSS: {f'{rss:.1f} MB' if rss is not None else '--'} (pico {peak:.1f} MB)\n"
+                f"Objetos Python: {len(gc.get_objects()):,}\n"
+                f"GC por geração: {' / '.join(str(n) for n in gc.get_count())}"
+            ),
+            inline=False
+        )
+
+        enabled = [name for name, value in bot.intents if value]
+        shards = getattr(bot, "shard_ids", None)
+        embed.add_field(
+            name="Perfil do gateway",
+            value=(
+                f"Intents: {', '.join(enabled) or 'nenhum'}\n"
+                f"Cache de membros: {'sim' if bot._connection.member_cache_flags.value else 'não'}; "
+                f"mensagens: {bot._connection.max_messages or 'desativado'}\n"
+                f"Shards: {bot.shard_count or 1}"
+                + (f" (este processo: {', '.join(map(str, shards))})" if shards else "")
+            ),
+            inline=False
+        )
+
+        embed.add_field(
+            name="Cache do discord.py",
+            value=(
+                f"Servidores: {len(guilds)}\n"
+                f"Canais: {sum(len(g.channels) for g in guilds)}\n"
+                f"Cargos: {sum(len(g.roles) for g in guilds)}\n"
+                f"Membros: {sum(len(g.members) for g in guilds)}\n"
+                f"Usuários: {len(bot.users)}\n"
+                f"Mensagens: {len(bot.cached_messages)}\n"
+                f"Emojis / figurinhas: {len(bot.emojis)} / {len(bot.stickers)}\n"
+                f"Views persistentes: {len(bot.persistent_views)}"
+            ),
+            inline=True
+        )
+
+        lines = []
+        status = bot.get_cog("StatusCog")
+        if status is not None:
+            lines.append(f"Snapshots de status: {len(status.snapshots)}")
+            lines.append(f"Mensagens fixas: {status.publisher.cached_messages()}")
+        updates = bot.get_cog("UpdatesCog")
+        if updates is not None:
+            lines.append(f"Updates em cache: {len(updates.cache)}")
+        uptime = bot.get_cog("UptimeCog")
+        if uptime is not None:
+            lines.append(f"Períodos de uptime: {uptime.engine.cached_units()}")
+        embed.add_field(name="Caches do bot", value="\n".join(lines) or "--", inline=True)
+        return embed
+
+    @debug.command(name="memory", description="Mostra o uso de memória e o que cada cache está guardando")
+    async def memory(self, interaction: discord.Interaction):
+        await interaction.response.send_message(embed=self.build_memory_embed(), ephemeral=True)
+
+
+async def setup(bot):
+    await bot.add_cog(DebugCog(bot))
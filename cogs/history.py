@@ -2,25 +2,37 @@ import discord
 from discord.ext import commands
 from discord import Embed, app_commands, Interaction
 from discord.ui import View, Button
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
+from collections import OrderedDict
 from datetime import datetime
 from utils import ms_to_str, format_datetime_br  # Assumindo que você já tenha essas funções
 
-MONGO_URI = os.getenv("MONGO_URI")
-DB_NAME = os.getenv("MONGO_DB")
-COLL_STATUS_LOGS = os.getenv("MONGO_STATUS_LOGS_COLLECTION", "status_logs")
-COLL_UPDATES = os.getenv("MONGO_UPDATES_COLLECTION", "updates")
+HISTORY_PAGE_CACHE = int(os.getenv("HISTORY_PAGE_CACHE") or 5)  # Páginas renderizadas mantidas por view
 
 
 class HistoryView(View):
-    def __init__(self, ctx, embeds):
+    """
+    Paginação sob demanda do histórico: cada página é buscada por keyset
+    (timestamp, _id) no repositório e renderizada apenas quando o botão é clicado. Apenas as
+    últimas páginas renderizadas ficam em memória (LRU), então a memória por
+    view é constante mesmo navegando por todo o histórico.
+    """
+
+    def __init__(self, ctx, repository, render, first, has_next):
         super().__init__(timeout=120)
         self.ctx = ctx
-        self.embeds = embeds
+        self.repository = repository
+        self.render = render
         self.index = 0
         self.message = None
 
+        # índice da página -> (chave keyset, embed, existe página seguinte)
+        self.pages = OrderedDict()
+        self.key = self.key_of(first)
+        self.has_next = has_next
+        self.embed = render(first)
+        self.remember()
+
         # Botões
         self.prev_button = Button(label="⬅️ Anterior", style=discord.ButtonStyle.primary)
         self.next_button = Button(label="Próximo ➡️", style=discord.ButtonStyle.primary)
@@ -30,35 +42,66 @@ class HistoryView(View):
         self.add_item(self.next_button)
         self.update_buttons()
 
+    @staticmethod
+    def key_of(doc):
+        return doc["timestamp"], doc["_id"]
+
+    def remember(self):
+        self.pages[self.index] = (self.key, self.embed, self.has_next)
+        self.pages.move_to_end(self.index)
+        while len(self.pages) > HISTORY_PAGE_CACHE:
+            self.pages.popitem(last=False)
+
+    async def fetch_page(self, older: bool):
+        """Busca o documento vizinho da página atual (e um a mais, para saber se há continuação)"""
+        return await self.repository.page(self.key, older=older, limit=2)
+
+    async def go_to(self, index: int):
+        cached = self.pages.get(index)
+        if cached:
+            self.index = index
+            self.key, self.embed, self.has_next = cached
+            self.pages.move_to_end(index)
+            return True
+
+        older = index > self.index
+        docs = await self.fetch_page(older)
+        if not docs:
+            return False
+        self.index = index
+        self.key = self.key_of(docs[0])
+        self.embed = self.render(docs[0])
+        # Voltando para páginas mais recentes, sempre existe a página de onde viemos
+        self.has_next = len(docs) > 1 if older else True
+        self.remember()
+        return True
+
     def update_buttons(self):
         self.prev_button.disabled = self.index == 0
-        self.next_button.disabled = self.index >= len(self.embeds) - 1
+        self.next_button.disabled = not self.has_next
 
-    async def prev_page(self, interaction: Interaction):
-        if interaction.user != self.ctx.user:
+    async def change_page(self, interaction: Interaction, step: int):
+        if interaction.user != self.ctx.author:
             return await interaction.response.send_message(
                 "❌ Apenas quem usou o comando pode interagir.", ephemeral=True
             )
-        self.index -= 1
+        if not await self.go_to(self.index + step) and step > 0:
+            self.has_next = False
         self.update_buttons()
-        await interaction.response.edit_message(embed=self.embeds[self.index], view=self)
+        await interaction.response.edit_message(embed=self.embed, view=self)
+
+    async def prev_page(self, interaction: Interaction):
+        await self.change_page(interaction, -1)
 
     async def next_page(self, interaction: Interaction):
-        if interaction.user != self.ctx.user:
-            return await interaction.response.send_message(
-                "❌ Apenas quem usou o comando pode interagir.", ephemeral=True
-            )
-        self.index += 1
-        self.update_buttons()
-        await interaction.response.edit_message(embed=self.embeds[self.index], view=self)
+        await self.change_page(interaction, 1)
 
 
 class HistoryCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        db = AsyncIOMotorClient(MONGO_URI)[DB_NAME]
-        self.db_status = db[COLL_STATUS_LOGS]
-        self.db_updates = db[COLL_UPDATES]
+        self.status_logs = bot.db.logs
+        self.updates = bot.db.updates
 
     def build_status_embed(self, log):
         # Converte timestamp para datetime se necessário
@@ -68,6 +111,8 @@ class HistoryCog(commands.Cog):
             color=0x00FF00 if log["online"] else 0xFF0000,
             timestamp=ts
         )
+        if log.get("target"):
+            embed.add_field(name="Alvo", value=log["target"])
         embed.add_field(name="Status", value="ONLINE 🟢" if log["online"] else "OFFLINE 🔴")
         embed.add_field(name="Código HTTP", value=str(log["http_code"]))
         embed.add_field(name="Tempo de resposta", value=f"{log['response_time']}ms")
@@ -98,23 +143,20 @@ class HistoryCog(commands.Cog):
         await ctx.interaction.response.defer(ephemeral=True)
 
         if tipo.value == "status":
-            cursor = self.db_status.find().sort("timestamp", -1).limit(20)
-            logs = await cursor.to_list(length=20)
-            if not logs:
-                await ctx.interaction.followup.send("Nenhum histórico de status encontrado.", ephemeral=True)
-                return
-            embeds = [self.build_status_embed(log) for log in logs]
-
+            repository, render = self.status_logs, self.build_status_embed
+            empty = "Nenhum histórico de status encontrado."
         elif tipo.value == "updates":
-            cursor = self.db_updates.find().sort("timestamp", -1).limit(20)
-            logs = await cursor.to_list(length=20)
-            if not logs:
-                await ctx.interaction.followup.send("Nenhum histórico de updates encontrado.", ephemeral=True)
-                return
-            embeds = [self.build_updates_embed(log) for log in logs]
-
-        view = HistoryView(ctx, embeds)
-        await ctx.interaction.followup.send(embed=embeds[0], view=view, ephemeral=True)
+            repository, render = self.updates, self.build_updates_embed
+            empty = "Nenhum histórico de updates encontrado."
+
+        # Apenas a primeira página (e a existência da segunda) é buscada agora
+        logs = await repository.page(limit=2)
+        if not logs:
+            await ctx.interaction.followup.send(empty, ephemeral=True)
+            return
+
+        view = HistoryView(ctx, repository, render, logs[0], has_next=len(logs) > 1)
+        await ctx.interaction.followup.send(embed=view.embed, view=view, ephemeral=True)
 
 
 async def setup(bot):
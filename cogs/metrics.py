@@ -0,0 +1,61 @@
+import discord
+from discord.ext import commands
+import os
+import logging
+
+from core.metrics import REGISTRY, MetricsServer, GATEWAY_LATENCY, COMMAND_DURATION
+
+log = logging.getLogger(__name__)
+
+METRICS_HOST = os.getenv("METRICS_HOST") or "127.0.0.1"  # Use 0.0.0.0 para expor fora do container
+METRICS_PORT = int(os.getenv("METRICS_PORT") or 9108)  # 0 desativa o endpoint
+
+
+class MetricsCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.server = MetricsServer(REGISTRY, METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+        self._tree_on_error = None
+
+    async def cog_load(self):
+        REGISTRY.on_collect(self.collect_gateway)
+        # Comandos que falham não disparam on_app_command_completion
+        self._tree_on_error = self.bot.tree.on_error
+        self.bot.tree.on_error = self.on_tree_error
+        if self.server:
+            try:
+                await self.server.start()
+            except OSError as e:
+                log.warning(f"⚠️ Não foi possível abrir o endpoint de métricas na porta {METRICS_PORT}: %s", e)
+                self.server = None
+
+    async def cog_unload(self):
+        REGISTRY.remove_collector(self.collect_gateway)
+        if self._tree_on_error is not None:
+            self.bot.tree.on_error = self._tree_on_error
+        if self.server:
+            await self.server.stop()
+
+    def collect_gateway(self):
+        latency = self.bot.latency
+        if latency == latency and latency != float("inf"):  # nan/inf antes do primeiro heartbeat
+            GATEWAY_LATENCY.set(latency)
+
+    @staticmethod
+    def observe_command(interaction: discord.Interaction, outcome: str):
+        command = interaction.command
+        name = command.qualified_name if command else "desconhecido"
+        elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        COMMAND_DURATION.observe(elapsed, command=name, outcome=outcome)
+
+    @commands.Cog.listener()
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        self.observe_command(interaction, "ok")
+
+    async def on_tree_error(self, interaction: discord.Interaction, error):
+        self.observe_command(interaction, "error")
+        await self._tree_on_error(interaction, error)
+
+
+async def setup(bot):
+    await bot.add_cog(MetricsCog(bot))
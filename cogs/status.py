@@ -2,88 +2,218 @@ import discord
 from discord.ext import commands, tasks
 from discord import Embed
 from discord import app_commands
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
-from datetime import datetime
 import time
+import asyncio
+import logging
+from datetime import datetime
+from types import MappingProxyType
+from typing import NamedTuple
 
 from utils import get_site_status, ms_to_str, format_datetime_br, BR_TZ
+from core.monitor import (
+    MonitorEngine,
+    load_targets,
+    STATUS_INTERVAL,
+    STATUS_FAST_INTERVAL,
+    STATUS_CONFIRM_FAILURES,
+    STATUS_BACKOFF_MAX,
+    STATUS_JITTER,
+    STATUS_SAMPLE_MAX_GAP,
+    sample_max_gap,
+)
+from core.publisher import EmbedPublisher
+from core.histogram import RollingHistogram
+from core.metrics import LoopLagTracker, PROBE_DURATION, PROBE_RESULTS
+from database.state_store import WriteBehindStore
+from database.log_writer import BufferedLogWriter, build_sample
+from database.rollup import rollup_status_logs
+
+log = logging.getLogger(__name__)
 
 STATUS_CHANNEL_ID = int(os.getenv("STATUS_CHANNEL_ID"))
 KOOKIE_STATUS_URL = os.getenv("KOOKIE_STATUS_URL")
-MONGO_URI = os.getenv("MONGO_URI")
-DB_NAME = os.getenv("MONGO_DB")
 
-COLL_STATE = os.getenv("MONGO_STATUS_COLLECTION", "status")
-COLL_LOGS = os.getenv("MONGO_STATUS_LOGS_COLLECTION", "status_logs")
-COLL_ARCHIVE = os.getenv("MONGO_STATUS_ARCHIVE_COLLECTION", "status_logs_archive")
+# Motor de monitoramento (intervalos, confirmação e backoff vêm de core.monitor)
+STATUS_CONCURRENCY = int(os.getenv("STATUS_CONCURRENCY") or 20)  # Verificações simultâneas
+STATE_FLUSH_INTERVAL = float(os.getenv("STATE_FLUSH_INTERVAL") or 30)  # Intervalo de gravação do estado (s)
+
+# Edição das mensagens fixas de status
+STATUS_EDIT_MIN_INTERVAL = float(os.getenv("STATUS_EDIT_MIN_INTERVAL") or 300)  # Intervalo mínimo entre edições só de contadores (s)
+# Campos que mudam a cada verificação; sozinhos não justificam uma edição antes do intervalo mínimo
+VOLATILE_FIELDS = (
+    "Tempo de resposta",
+    "Última verificação",
+    "Tempo contínuo online",
+    "Tempo contínuo offline",
+    "Tempo total online",
+    "Tempo total offline",
+    "Latência p50 / p95 / p99",
+)
+
+# Percentis de latência em janelas deslizantes: nome -> (duração em s, quantidade de slots)
+LATENCY_WINDOWS = {
+    "1h": (3600, 12),
+    "24h": (86400, 24),
+}
+LATENCY_ALERT_FACTOR = float(os.getenv("LATENCY_ALERT_FACTOR") or 2)  # p95 da última hora / p95 de 24h que gera alerta
+LATENCY_ALERT_MIN_SAMPLES = 10  # Amostras mínimas na última hora antes de alertar
+
+# Recuperação da mensagem de status (fixadas → histórico)
+STATUS_RECOVERY_BACKOFF = float(os.getenv("STATUS_RECOVERY_BACKOFF") or 60)  # Espera após uma busca sem sucesso (s), dobrada a cada nova falha
+STATUS_RECOVERY_BACKOFF_MAX = float(os.getenv("STATUS_RECOVERY_BACKOFF_MAX") or 3600)  # Espera máxima (s)
+STATUS_PINS_CACHE_TTL = 30  # Mensagens fixadas reaproveitadas entre alvos (s)
+
+# Nova tentativa de assumir o monitoramento quando a réplica é líder mas o início falhou
+STATUS_LEADING_RETRY = float(os.getenv("STATUS_LEADING_RETRY") or 15)  # Primeira espera (s), dobrada a cada falha
+STATUS_LEADING_RETRY_MAX = 300  # Espera máxima (s)
+
+# Histórico de verificações (status_logs)
+STATUS_LOGS_FLUSH_INTERVAL = float(os.getenv("STATUS_LOGS_FLUSH_INTERVAL") or 30)  # Intervalo de gravação em lote (s)
+STATUS_LOGS_BATCH_SIZE = int(os.getenv("STATUS_LOGS_BATCH_SIZE") or 500)  # Amostras por insert_many
+
+# Compactação das amostras em buckets horários/diários (status_logs_archive)
+STATUS_ROLLUP_AFTER_DAYS = float(os.getenv("STATUS_ROLLUP_AFTER_DAYS") or 7)  # Idade mínima das amostras compactadas
+
+
+def default_state() -> dict:
+    """Estado base de um alvo"""
+    return {
+        "online": None,
+        "last_status_change": None,  # timestamp
+
+        "continuous_online": 0.0,
+        "continuous_offline": 0.0,
+
+        "total_online": 0.0,
+        "total_offline": 0.0,
+
+        "downtimes_count": 0,
+
+        "last_http_code": None,
+        "last_response_time": 0,
+        "last_connect_time": 0,
+        "last_ttfb": 0,
+        "last_check": None,
+        "latency": {},  # janela -> RollingHistogram.to_doc()
+
+        "status_channel_id": None,
+        "status_message_id": None
+    }
+
+
+def failed_probe(timestamp) -> dict:
+    """Resultado de uma verificação que não obteve resposta"""
+    return {"online": False, "http_code": 0, "response_time": 0, "connect_time": 0, "ttfb": 0, "timestamp": timestamp}
+
+
+class StatusSnapshot(NamedTuple):
+    """
+    Retrato imutável do status de um alvo, publicado a cada verificação.
+    O embed já vem montado e não deve ser alterado por quem o usa.
+    """
+    version: int
+    target: str
+    state: MappingProxyType
+    embed: Embed
+    created_at: float  # time.time()
 
 
 class StatusCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        db = AsyncIOMotorClient(MONGO_URI)[DB_NAME]
-        self.db_state = db[COLL_STATE]
-        self.db_logs = db[COLL_LOGS]
-        self.db_archive = db[COLL_ARCHIVE]
+        self.http = bot.http_client
+        self.db = bot.db
 
         self.monitor_started = False
+        self._leadership_lock = asyncio.Lock()
+        self._leading_failures = 0
+        self._leading_retry = None  # task da próxima tentativa de start_leading
+
+        # Alvos monitorados e estado de cada um (chave = nome do alvo = _id no MongoDB)
+        self.targets = {t.name: t for t in load_targets(KOOKIE_STATUS_URL)}
+        self.states = {name: default_state() for name in self.targets}
+        self.store = WriteBehindStore(self.db.state, flush_interval=STATE_FLUSH_INTERVAL)
+        self.log_writer = BufferedLogWriter(
+            self.db.logs,
+            flush_interval=STATUS_LOGS_FLUSH_INTERVAL,
+            batch_size=STATUS_LOGS_BATCH_SIZE,
+        )
 
-        # Estado base
-        self.state = {
-            "online": None,
-            "last_status_change": None,  # timestamp
-
-            "continuous_online": 0.0,
-            "continuous_offline": 0.0,
-
-            "total_online": 0.0,
-            "total_offline": 0.0,
-
-            "downtimes_count": 0,
+        # Último snapshot de cada alvo; /status responde daqui sem chamadas de rede
+        self.snapshots = {}
+        self.publisher = EmbedPublisher(min_refresh=STATUS_EDIT_MIN_INTERVAL, volatile=VOLATILE_FIELDS)
+        self._recovery_misses = {}  # alvo -> (buscas sem sucesso seguidas, time.monotonic() da próxima tentativa)
+        self._pins_cache = (0, None)
+
+        # Histogramas de latência por alvo e janela (restaurados do estado em load_states)
+        self.latency = {name: self.new_latency_windows() for name in self.targets}
+        self._latency_degraded = set()
+        self.rollup_lag = LoopLagTracker("rollup_logs", 3600)
+
+        self.monitor = MonitorEngine(
+            self.targets.values(),
+            probe=self.probe,
+            on_result=self.update_state,
+            on_sample=self.record_sample,
+            interval=STATUS_INTERVAL,
+            concurrency=STATUS_CONCURRENCY,
+            fast_interval=STATUS_FAST_INTERVAL,
+            confirm=STATUS_CONFIRM_FAILURES,
+            backoff_max=STATUS_BACKOFF_MAX,
+            jitter=STATUS_JITTER,
+        )
 
-            "last_http_code": None,
-            "last_response_time": 0,
-            "last_check": None,
+    async def cog_unload(self):
+        self.cancel_leading_retry()
+        self.follow_states.cancel()
+        self.rollup_logs.cancel()
+        await self.monitor.stop()
+        await self.store.close()
+        await self.log_writer.close()
 
-            "status_message_id": None
+    # -------------------- Persistência --------------------
+    async def load_states(self):
+        log.info("🔄 Carregando estados do MongoDB...")
+        found = await self.store.load_many(self.states)
+        for name, state in self.states.items():
+            if name in found:
+                self.latency[name] = self.new_latency_windows(state.get("latency"))
+                log.info(f"✅ Estado de '{name}' carregado (última verificação: {state.get('last_check')}, quedas: {state.get('downtimes_count')}).")
+            else:
+                log.warning(f"⚠️ Estado de '{name}' não encontrado. Inicializando novo estado.")
+
+    @staticmethod
+    def new_latency_windows(docs=None) -> dict:
+        docs = docs or {}
+        return {
+            name: RollingHistogram.from_doc(docs.get(name), window, slots)
+            for name, (window, slots) in LATENCY_WINDOWS.items()
         }
 
-    # -------------------- Persistência --------------------
-    async def load_state(self):
-        print("🔄 Carregando estado do MongoDB...")
-        doc = await self.db_state.find_one({"_id": "kookie"})
-        if doc and "state" in doc:
-            self.state.update(doc["state"])
-            print("✅ Estado carregado:", self.state)
-        else:
-            await self.db_state.insert_one({"_id": "kookie", "state": self.state})
-            print("⚠️ Estado não encontrado. Inicializando novo estado.")
-            print("💾 Estado salvo no MongoDB:", self.state)
-
-    async def save_state(self):
-        await self.db_state.update_one(
-            {"_id": "kookie"},
-            {"$set": {"state": self.state}},
-            upsert=True
-        )
-        print("💾 Estado atualizado no MongoDB.")
+    def save_state(self, target):
+        """Marca o estado como alterado; a gravação acontece no próximo flush do write-behind"""
+        self.store.mark_dirty(target.name)
 
     # -------------------- Embed --------------------
-    def build_embed(self, s, changed=False):
+    def build_embed(self, target, s, changed=False):
         online = s["online"]
         color = 0x00FF00 if online else 0xFF0000
         icon = "🟢" if online else "🔴"
 
         embed = Embed(
-            title="Status do Kookie",
-            url=KOOKIE_STATUS_URL,
+            title=f"Status do {target.label}",
+            url=target.url,
             color=color
         )
 
         embed.add_field(name="Status atual", value=f"{icon} {'ONLINE' if online else 'OFFLINE'}", inline=True)
         embed.add_field(name="Código HTTP", value=str(s["last_http_code"]), inline=True)
-        embed.add_field(name="Tempo de resposta", value=f"{s['last_response_time']}ms", inline=True)
+        embed.add_field(
+            name="Tempo de resposta",
+            value=f"{s['last_response_time']}ms (conexão {s['last_connect_time']}ms · TTFB {s['last_ttfb']}ms)",
+            inline=True
+        )
         embed.add_field(
             name="Última verificação",
             value=format_datetime_br(s["last_check"]) if s["last_check"] else "--",
@@ -105,127 +235,292 @@ class StatusCog(commands.Cog):
             )
 
         embed.add_field(name="Total de quedas", value=str(s["downtimes_count"]), inline=True)
+        embed.add_field(name="Latência p50 / p95 / p99", value=self.latency_summary(target), inline=False)
         embed.add_field(name="Tempo total online", value=ms_to_str(s["total_online"] * 1000), inline=True)
         embed.add_field(name="Tempo total offline", value=ms_to_str(s["total_offline"] * 1000), inline=True)
 
         return embed
 
+    def latency_summary(self, target) -> str:
+        now_ts = datetime.now(BR_TZ).timestamp()
+        lines = []
+        for name, rolling in self.latency[target.name].items():
+            p = rolling.snapshot(now_ts).percentiles()
+            values = " / ".join(f"{p[k]:.0f}ms" if p[k] is not None else "--" for k in ("p50", "p95", "p99"))
+            lines.append(f"{name}: {values}")
+        return "\n".join(lines)
+
+    def record_latency(self, target, st, now_ts):
+        """Registra a latência nas janelas deslizantes e avisa se a última hora degradou"""
+        windows = self.latency[target.name]
+        if st["online"] and st["response_time"]:
+            for rolling in windows.values():
+                rolling.add(st["response_time"], now_ts)
+        self.states[target.name]["latency"] = {name: rolling.to_doc() for name, rolling in windows.items()}
+
+        recent = windows["1h"].snapshot(now_ts)
+        baseline = windows["24h"].snapshot(now_ts).percentile(95)
+        degraded = (
+            recent.count >= LATENCY_ALERT_MIN_SAMPLES
+            and baseline is not None
+            and recent.percentile(95) > baseline * LATENCY_ALERT_FACTOR
+        )
+        if degraded and target.name not in self._latency_degraded:
+            self._latency_degraded.add(target.name)
+            log.warning(
+                f"🐢 Latência de {target.label} degradada: p95 da última hora {recent.percentile(95):.0f}ms "
+                f"(p95 de 24h: {baseline:.0f}ms)",
+                extra={"target": target.name},
+            )
+        elif not degraded and target.name in self._latency_degraded:
+            self._latency_degraded.discard(target.name)
+            log.info(f"✅ Latência de {target.label} normalizada.")
+
     # -------------------- Mensagem fixa --------------------
-    async def get_status_message(self):
+    def is_status_message(self, target, msg) -> bool:
+        return (
+            msg.author.id == self.bot.user.id
+            and bool(msg.embeds)
+            and msg.embeds[0].title == f"Status do {target.label}"
+        )
+
+    def remember_message(self, target, msg):
+        """Persiste o par canal/mensagem e limpa o backoff de 'não encontrada'"""
+        state = self.states[target.name]
+        state["status_channel_id"] = msg.channel.id
+        state["status_message_id"] = msg.id
+        self.save_state(target)
+        self._recovery_misses.pop(target.name, None)
+
+    def forget_message(self, target):
+        state = self.states[target.name]
+        state["status_message_id"] = None
+        self.save_state(target)
+        self.publisher.forget(target.name)
+
+    async def get_pins(self, channel) -> list:
+        """Mensagens fixadas do canal, compartilhadas entre os alvos por alguns segundos"""
+        cached_at, pins = self._pins_cache
+        if pins is not None and time.monotonic() - cached_at < STATUS_PINS_CACHE_TTL:
+            return pins
+        pins = [msg async for msg in channel.pins()]
+        self._pins_cache = (time.monotonic(), pins)
+        return pins
+
+    async def get_status_message(self, target):
+        """
+        Recupera a mensagem de status do alvo: pelo id salvo, depois entre as
+        mensagens fixadas e, em último caso, nas últimas 200 do histórico.
+        Uma busca sem sucesso fica em backoff para não repetir a varredura.
+        """
         channel = self.bot.get_channel(STATUS_CHANNEL_ID)
         if not channel:
             return None
 
-        msg_id = self.state.get("status_message_id")
+        state = self.states[target.name]
+        msg_id = state.get("status_message_id")
+        # Id salvo para outro canal (STATUS_CHANNEL_ID mudou) não serve mais
+        if msg_id and state.get("status_channel_id") not in (None, channel.id):
+            msg_id = None
         if msg_id:
             try:
                 msg = await channel.fetch_message(msg_id)
                 if msg.author.id == self.bot.user.id:
+                    self.remember_message(target, msg)
                     return msg
-                else:
-                    self.state["status_message_id"] = None
-                    await self.save_state()
+                self.forget_message(target)
             except discord.NotFound:
-                self.state["status_message_id"] = None
-                await self.save_state()
+                self.forget_message(target)
             except Exception:
                 pass
 
-        # Procurar manualmente nas últimas 200 mensagens
+        # Busca recente sem sucesso: não repete a varredura até o fim do backoff
+        miss = self._recovery_misses.get(target.name)
+        if miss and time.monotonic() < miss[1]:
+            return None
+
         try:
+            for msg in await self.get_pins(channel):
+                if self.is_status_message(target, msg):
+                    self.remember_message(target, msg)
+                    log.info(f"📌 Mensagem de status de '{target.name}' recuperada entre as fixadas (id salvo).")
+                    return msg
+
+            # Mensagens antigas, de antes de serem fixadas automaticamente
             async for msg in channel.history(limit=200):
-                if msg.author.id == self.bot.user.id and msg.embeds:
-                    e = msg.embeds[0]
-                    if e.title and "Status do Kookie" in e.title:
-                        self.state["status_message_id"] = msg.id
-                        await self.save_state()
-                        print("🔁 Mensagem de status recuperada automaticamente (id salvo).")
-                        return msg
+                if self.is_status_message(target, msg):
+                    self.remember_message(target, msg)
+                    log.info(f"🔁 Mensagem de status de '{target.name}' recuperada automaticamente (id salvo).")
+                    await self.pin_message(target, msg)
+                    return msg
         except Exception as e:
-            print("⚠️ Erro ao procurar mensagem no canal:", e)
+            log.warning("⚠️ Erro ao procurar mensagem no canal: %s", e)
 
+        misses = miss[0] + 1 if miss else 1
+        delay = min(STATUS_RECOVERY_BACKOFF * 2 ** (misses - 1), STATUS_RECOVERY_BACKOFF_MAX)
+        self._recovery_misses[target.name] = (misses, time.monotonic() + delay)
         return None
 
+    async def pin_message(self, target, msg):
+        try:
+            await msg.pin(reason=f"Mensagem de status de {target.label}")
+            self._pins_cache = (0, None)
+        except discord.HTTPException as e:
+            # Sem permissão ou limite de 50 fixadas: a recuperação cai no histórico
+            log.warning(f"⚠️ Não foi possível fixar a mensagem de status de '{target.name}': %s", e)
+
+    def publish_snapshot(self, target) -> StatusSnapshot:
+        """Monta o embed uma única vez e substitui atomicamente o snapshot do alvo"""
+        previous = self.snapshots.get(target.name)
+        state = self.states[target.name]
+        snapshot = StatusSnapshot(
+            version=previous.version + 1 if previous else 1,
+            target=target.name,
+            state=MappingProxyType(dict(state)),
+            embed=self.build_embed(target, state),
+            created_at=time.time(),
+        )
+        self.snapshots[target.name] = snapshot
+        return snapshot
+
+    async def publish_embed(self, target, force=False):
+        """
+        Edita a mensagem de status do alvo ou envia uma nova. A edição é pulada
+        quando só os contadores mudaram e o intervalo mínimo ainda não passou.
+        """
+        embed = self.publish_snapshot(target).embed
+        if not self.publisher.should_edit(target.name, embed, force):
+            return
+
+        msg = self.publisher.message(target.name) or await self.get_status_message(target)
+        if msg:
+            try:
+                edited = await msg.edit(embed=embed)
+                self.publisher.sent(target.name, edited or msg, embed)
+                return
+            except discord.NotFound:
+                # Mensagem apagada desde a última edição: envia uma nova
+                log.warning(f"⚠️ Mensagem de status de '{target.name}' não existe mais. Enviando uma nova.")
+                self.forget_message(target)
+            except Exception as e:
+                log.warning(f"⚠️ Falha ao editar mensagem existente de '{target.name}': %s", e)
+                return
+
+        channel = self.bot.get_channel(STATUS_CHANNEL_ID)
+        if channel:
+            sent = await channel.send(embed=embed)
+            self.publisher.sent(target.name, sent, embed)
+            self.remember_message(target, sent)
+            await self.pin_message(target, sent)
+            # O par canal/mensagem é gravado na hora para sobreviver a um restart
+            await self.store.flush(target.name)
+            log.info(f"📤 Embed de '{target.name}' enviado e fixado no canal; id salvo.")
+
     # -------------------- Atualização de estado --------------------
-    async def update_state(self, st):
+    async def update_state(self, target, st):
+        state = self.states[target.name]
         now_dt = datetime.now(BR_TZ)
         now_ts = now_dt.timestamp()
 
         if st is None:
-            st = {"online": False, "http_code": 0, "response_time": 0}
+            st = failed_probe(now_dt)
 
-        prev_online = self.state["online"]
+        prev_online = state["online"]
         status_changed = prev_online is not None and prev_online != st["online"]
 
-        if self.state["last_status_change"] is None:
-            self.state["last_status_change"] = now_ts
+        if state["last_status_change"] is None:
+            state["last_status_change"] = now_ts
 
-        delta = now_ts - self.state["last_status_change"]
+        delta = now_ts - state["last_status_change"]
 
         if status_changed:
             if prev_online:
-                self.state["total_online"] += self.state["continuous_online"] + delta
+                state["total_online"] += state["continuous_online"] + delta
             else:
-                self.state["total_offline"] += self.state["continuous_offline"] + delta
+                state["total_offline"] += state["continuous_offline"] + delta
 
-            self.state["continuous_online"] = 0
-            self.state["continuous_offline"] = 0
+            state["continuous_online"] = 0
+            state["continuous_offline"] = 0
 
             if prev_online and not st["online"]:
-                self.state["downtimes_count"] += 1
+                state["downtimes_count"] += 1
         else:
             if st["online"]:
-                self.state["continuous_online"] += delta
+                state["continuous_online"] += delta
             else:
-                self.state["continuous_offline"] += delta
-
-        self.state["online"] = st["online"]
-        self.state["last_http_code"] = st["http_code"]
-        self.state["last_response_time"] = st["response_time"]
-        self.state["last_check"] = now_dt
-        self.state["last_status_change"] = now_ts
-
-        await self.save_state()
+                state["continuous_offline"] += delta
+
+        state["online"] = st["online"]
+        state["last_http_code"] = st["http_code"]
+        state["last_response_time"] = st["response_time"]
+        state["last_connect_time"] = st.get("connect_time", 0)
+        state["last_ttfb"] = st.get("ttfb", 0)
+        state["last_check"] = now_dt
+        state["last_status_change"] = now_ts
+        self.record_latency(target, st, now_ts)
+
+        self.save_state(target)
+        if status_changed:
+            # Transições online/offline são gravadas imediatamente
+            await self.store.flush(target.name)
 
         # -------------------- LOG DETALHADO --------------------
-        status_text = "ONLINE" if self.state["online"] else "OFFLINE"
-        cont_time = self.state["continuous_online"] if self.state["online"] else self.state["continuous_offline"]
-        total_time = self.state["total_online"] if self.state["online"] else self.state["total_offline"]
-
-        print(f"⏱️ [{now_dt.strftime('%d/%m/%Y %H:%M:%S')}] Status: {status_text}")
-        print(f"   Código HTTP: {self.state['last_http_code']}, Tempo de resposta: {self.state['last_response_time']}ms")
-        print(f"   Tempo contínuo {'online' if self.state['online'] else 'offline'}: {ms_to_str(cont_time*1000)}")
-        print(f"   Tempo total {'online' if self.state['online'] else 'offline'}: {ms_to_str(total_time*1000)}")
-        print(f"   Total de quedas: {self.state['downtimes_count']}")
-
-        # Atualiza embed
-        msg = await self.get_status_message()
-        channel = self.bot.get_channel(STATUS_CHANNEL_ID)
-        embed = self.build_embed(self.state)
+        # Uma linha estruturada por verificação; sem mudança de status ela é amostrada
+        status_text = "ONLINE" if state["online"] else "OFFLINE"
+        cont_time = state["continuous_online"] if state["online"] else state["continuous_offline"]
+        log.info(
+            f"⏱️ {target.label}: {status_text} (HTTP {state['last_http_code']}, {state['last_response_time']}ms)",
+            extra={
+                "target": target.name,
+                "online": state["online"],
+                "status_changed": status_changed,
+                "http_code": state["last_http_code"],
+                "response_time": state["last_response_time"],
+                "connect_time": state["last_connect_time"],
+                "ttfb": state["last_ttfb"],
+                "continuous": ms_to_str(cont_time * 1000),
+                "downtimes": state["downtimes_count"],
+                "sample_key": None if status_changed else f"tick:{target.name}",
+            },
+        )
 
-        if msg:
-            try:
-                await msg.edit(embed=embed)
-            except Exception:
-                print("⚠️ Falha ao editar mensagem existente.")
-        else:
-            if channel:
-                sent = await channel.send(embed=embed)
-                self.state["status_message_id"] = sent.id
-                await self.save_state()
-                print("📤 Embed enviado no canal e id salvo.")
+        # Atualiza embed (imediatamente em transições online/offline)
+        await self.publish_embed(target, force=status_changed)
 
     # -------------------- Monitor --------------------
-    @tasks.loop(seconds=60)
-    async def monitor(self):
+    def record_sample(self, target, st):
+        """Toda verificação vai para status_logs, inclusive falhas ainda não confirmadas"""
+        self.log_writer.add(build_sample(target.name, st or failed_probe(datetime.now(BR_TZ))))
+
+    async def probe(self, target):
+        st = await get_site_status(self.http, target.url)
+        if st.get("http_code") is None:
+            outcome = "error"
+        else:
+            outcome = "up" if st["online"] else "down"
+        PROBE_RESULTS.inc(target=target.name, outcome=outcome)
+        if st.get("response_time"):
+            PROBE_DURATION.observe(st["response_time"] / 1000, target=target.name)
+        return st
+
+    # -------------------- Compactação dos logs --------------------
+    @tasks.loop(hours=1)
+    async def rollup_logs(self):
+        self.rollup_lag.tick()
         try:
-            st = await get_site_status(KOOKIE_STATUS_URL)
-        except:
-            st = None
-        await self.update_state(st)
+            days = await rollup_status_logs(
+                self.db.logs,
+                STATUS_ROLLUP_AFTER_DAYS,
+                STATUS_SAMPLE_MAX_GAP,
+                {name: sample_max_gap(t) for name, t in self.targets.items()},
+            )
+            if days:
+                log.info(f"🗂️ {days} dia(s) de logs de status compactados em buckets horários/diários.")
+        except Exception as e:
+            log.error("❌ Falha ao compactar logs de status: %s", e)
 
-    @monitor.before_loop
-    async def before_monitor(self):
+    @rollup_logs.before_loop
+    async def before_rollup_logs(self):
         await self.bot.wait_until_ready()
 
     # -------------------- Comando /status --------------------
@@ -233,66 +528,135 @@ class StatusCog(commands.Cog):
         name="status",
         description="Mostra o status atual do Kookie"
     )
-    async def status_cmd(self, interaction: discord.Interaction):
-        msg = await self.get_status_message()
-        if msg:
-            await interaction.response.send_message(embed=msg.embeds[0], ephemeral=True)
+    @app_commands.describe(alvo="Alvo monitorado (padrão: o primeiro da lista)")
+    async def status_cmd(self, interaction: discord.Interaction, alvo: str = None):
+        target = self.targets.get(alvo) if alvo else next(iter(self.targets.values()), None)
+        if target is None:
+            await interaction.response.send_message("❌ Alvo de monitoramento desconhecido.", ephemeral=True)
             return
 
-        embed = self.build_embed(self.state)
+        # Antes da primeira verificação ainda não há snapshot: monta a partir do estado carregado
+        snapshot = self.snapshots.get(target.name)
+        embed = snapshot.embed if snapshot else self.build_embed(target, self.states[target.name])
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
-    # -------------------- READY --------------------
-    @commands.Cog.listener()
-    async def on_ready(self):
-        if self.monitor_started:
-            return
-
-        await self.load_state()
+    @status_cmd.autocomplete("alvo")
+    async def status_alvo_autocomplete(self, interaction: discord.Interaction, current: str):
+        current = current.lower()
+        return [
+            app_commands.Choice(name=t.label, value=t.name)
+            for t in self.targets.values()
+            if current in t.name.lower() or current in t.label.lower()
+        ][:25]
+
+    # -------------------- Liderança --------------------
+    async def start_leading(self):
+        """Assume o monitoramento: recarrega o estado gravado pela líder anterior e inicia as tarefas"""
+        await self.load_states()
+        self.store.start()
+        self.log_writer.start()
+
+        for target in self.targets.values():
+            state = self.states[target.name]
+
+            # Atualiza tempo contínuo desde a última mudança
+            now_dt = datetime.now(BR_TZ)
+            last_change = state.get("last_status_change")
+            if last_change:
+                delta = now_dt.timestamp() - last_change
+                if state.get("online"):
+                    state["continuous_online"] += delta
+                else:
+                    state["continuous_offline"] += delta
+            state["last_status_change"] = now_dt.timestamp()
+            self.save_state(target)
 
-        # Recupera mensagem existente ou busca manualmente
-        msg = await self.get_status_message()
+            # Recupera mensagem existente (ou busca manualmente) e atualiza o embed
+            await self.publish_embed(target)
 
-        # Atualiza tempo contínuo desde a última mudança
-        now_dt = datetime.now(BR_TZ)
-        last_change = self.state.get("last_status_change")
-        if last_change:
-            delta = now_dt.timestamp() - last_change
-            if self.state.get("online"):
-                self.state["continuous_online"] += delta
-            else:
-                self.state["continuous_offline"] += delta
-        self.state["last_status_change"] = now_dt.timestamp()
-        await self.save_state()
+        # Inicia monitoramento; a primeira verificação de cada alvo é distribuída ao longo do intervalo
+        self.monitor.start()
+        if not self.rollup_logs.is_running():
+            self.rollup_logs.start()
+        self.monitor_started = True
+        # Só deixa de seguir a líder anterior quando o monitor já está rodando
+        self.follow_states.cancel()
+        log.info(f"🟢 Monitor iniciado para {len(self.targets)} alvo(s) e mensagens de status sincronizadas com o canal.")
+
+    async def stop_leading(self):
+        """
+        Liderança perdida: para as verificações sem gravar o estado pendente,
+        que a nova líder já pode ter sobrescrito. As amostras de status_logs
+        são observações válidas e ainda são gravadas.
+        """
+        await self.halt_leading()
+        log.info("⏸️ Monitor pausado: outra réplica é a líder.")
+
+    async def halt_leading(self):
+        await self.monitor.stop()
+        self.rollup_logs.cancel()
+        await self.store.close(flush=False)
+        await self.log_writer.close()
+        for name in self.targets:
+            self.publisher.forget(name)
+        self.monitor_started = False
 
-        # Atualiza embed
-        if msg:
-            embed = self.build_embed(self.state)
-            try:
-                await msg.edit(embed=embed)
-            except Exception as e:
-                print("⚠️ Falha ao atualizar mensagem existente:", e)
+    async def try_start_leading(self):
+        """
+        start_leading protegido: se falhar (MongoDB ou Discord indisponível), desfaz
+        o início parcial, continua seguindo o estado gravado e tenta de novo com
+        backoff enquanto esta réplica ainda for a líder.
+        """
+        try:
+            await self.start_leading()
+        except Exception as e:
+            await self.halt_leading()
+            if not self.follow_states.is_running():
+                self.follow_states.start()
+            self._leading_failures += 1
+            delay = min(STATUS_LEADING_RETRY * 2 ** (self._leading_failures - 1), STATUS_LEADING_RETRY_MAX)
+            log.error(f"❌ Falha ao assumir o monitoramento (nova tentativa em {delay:.0f}s): %s", e)
+            if self._leading_retry is not None:
+                self._leading_retry.cancel()
+            self._leading_retry = asyncio.create_task(self.retry_leading(delay), name="status-leading-retry")
         else:
-            channel = self.bot.get_channel(STATUS_CHANNEL_ID)
-            if channel:
-                embed = self.build_embed(self.state)
-                sent = await channel.send(embed=embed)
-                self.state["status_message_id"] = sent.id
-                await self.save_state()
-                print("📤 Embed enviado no canal e id salvo.")
-
-        # Primeira verificação antes do loop
+            self._leading_failures = 0
+
+    async def retry_leading(self, delay: float):
+        await asyncio.sleep(delay)
+        self._leading_retry = None
+        await self.on_leadership_change(self.bot.lease.is_leader)
+
+    def cancel_leading_retry(self):
+        if self._leading_retry is not None:
+            self._leading_retry.cancel()
+            self._leading_retry = None
+        self._leading_failures = 0
+
+    @tasks.loop(seconds=STATUS_INTERVAL)
+    async def follow_states(self):
+        """Réplicas seguidoras atualizam os snapshots do /status com o estado gravado pela líder"""
         try:
-            st = await get_site_status(KOOKIE_STATUS_URL)
-        except:
-            st = None
-        await self.update_state(st)
-
-        # Inicia monitoramento
-        self.monitor.start()
-        self.monitor_started = True
-        print("🟢 Monitor iniciado e mensagem de status sincronizada com o canal.")
+            found = await self.db.state.find_many(list(self.targets))
+        except Exception as e:
+            log.warning("⚠️ Falha ao ler o estado gravado pela líder: %s", e)
+            return
+        for name, saved in found.items():
+            self.states[name].update(saved)
+            self.latency[name] = self.new_latency_windows(saved.get("latency"))
+            self.publish_snapshot(self.targets[name])
 
+    @commands.Cog.listener()
+    async def on_leadership_change(self, leader: bool):
+        async with self._leadership_lock:
+            if leader and not self.monitor_started:
+                await self.try_start_leading()
+            elif not leader:
+                self.cancel_leading_retry()
+                if self.monitor_started:
+                    await self.stop_leading()
+                if not self.follow_states.is_running():
+                    self.follow_states.start()
 
 async def setup(bot):
-    await bot.add_cog(StatusCog(bot))
\ No newline at end of file
+    await bot.add_cog(StatusCog(bot))
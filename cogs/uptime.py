@@ -0,0 +1,146 @@
+import discord
+from discord.ext import commands
+from discord import Embed, app_commands
+import os
+import pytz
+from datetime import datetime, timedelta
+
+from utils import ms_to_str, format_datetime_br, BR_TZ
+from core.monitor import load_targets, sample_max_gap, STATUS_SAMPLE_MAX_GAP
+from database.uptime import UptimeEngine
+
+KOOKIE_STATUS_URL = os.getenv("KOOKIE_STATUS_URL")
+
+UPTIME_CACHE_SIZE = int(os.getenv("UPTIME_CACHE_SIZE") or 5000)  # Horas/dias encerrados mantidos em memória
+
+WINDOWS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+    "90d": timedelta(days=90),
+}
+
+
+def parse_date_br(text: str) -> datetime:
+    """Converte dd/mm/yyyy (horário de Brasília) em datetime UTC sem timezone"""
+    local = BR_TZ.localize(datetime.strptime(text.strip(), "%d/%m/%Y"))
+    return local.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def seconds_to_str(seconds) -> str:
+    return ms_to_str(seconds * 1000) if seconds is not None else "--"
+
+
+class UptimeCog(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.targets = {t.name: t for t in load_targets(KOOKIE_STATUS_URL)}
+        self.engine = UptimeEngine(
+            bot.db.logs,
+            max_gap=STATUS_SAMPLE_MAX_GAP,
+            target_gaps={name: sample_max_gap(t) for name, t in self.targets.items()},
+            cache_size=UPTIME_CACHE_SIZE,
+        )
+
+    def build_uptime_embed(self, target, report):
+        uptime = report.uptime
+        if uptime is None:
+            color = 0x808080
+        elif uptime >= 99.9:
+            color = 0x00FF00
+        elif uptime >= 99:
+            color = 0xFFFF00
+        else:
+            color = 0xFF0000
+
+        start = report.start.replace(tzinfo=pytz.utc)
+        end = report.end.replace(tzinfo=pytz.utc)
+        embed = Embed(
+            title=f"⏱️ Uptime do {target.label}",
+            description=f"{format_datetime_br(start)} → {format_datetime_br(end)}",
+            color=color
+        )
+
+        stats = report.stats
+        p = report.percentiles()
+        embed.add_field(name="Uptime", value=f"{uptime:.3f}%" if uptime is not None else "--", inline=True)
+        embed.add_field(name="Quedas", value=str(stats.incidents), inline=True)
+        embed.add_field(name="Tempo offline", value=seconds_to_str(stats.down_seconds), inline=True)
+        embed.add_field(name="MTTR", value=seconds_to_str(report.mttr), inline=True)
+        embed.add_field(name="MTBF", value=seconds_to_str(report.mtbf), inline=True)
+        embed.add_field(name="Verificações", value=str(stats.count), inline=True)
+        embed.add_field(
+            name="Latência p50 / p95 / p99",
+            value=" / ".join(f"{p[k]:.0f}ms" if p[k] is not None else "--" for k in ("p50", "p95", "p99")),
+            inline=False
+        )
+        return embed
+
+    @app_commands.command(
+        name="uptime",
+        description="Mostra uptime, MTTR, MTBF e latência do Kookie em uma janela de tempo"
+    )
+    @app_commands.describe(
+        janela="Período da consulta",
+        alvo="Alvo monitorado (padrão: o primeiro da lista)",
+        inicio="Início da janela personalizada (dd/mm/aaaa)",
+        fim="Fim da janela personalizada (dd/mm/aaaa, inclusivo)"
+    )
+    @app_commands.choices(janela=[
+        app_commands.Choice(name="Últimas 24 horas", value="24h"),
+        app_commands.Choice(name="Últimos 7 dias", value="7d"),
+        app_commands.Choice(name="Últimos 30 dias", value="30d"),
+        app_commands.Choice(name="Últimos 90 dias", value="90d"),
+        app_commands.Choice(name="Personalizada", value="custom"),
+    ])
+    async def uptime_cmd(
+        self,
+        interaction: discord.Interaction,
+        janela: app_commands.Choice[str],
+        alvo: str = None,
+        inicio: str = None,
+        fim: str = None
+    ):
+        target = self.targets.get(alvo) if alvo else next(iter(self.targets.values()), None)
+        if target is None:
+            await interaction.response.send_message("❌ Alvo de monitoramento desconhecido.", ephemeral=True)
+            return
+
+        now = datetime.utcnow()
+        if janela.value == "custom":
+            try:
+                if not inicio:
+                    raise ValueError("inicio ausente")
+                start = parse_date_br(inicio)
+                end = parse_date_br(fim) + timedelta(days=1) if fim else now
+            except ValueError:
+                await interaction.response.send_message(
+                    "❌ Informe `inicio` (e opcionalmente `fim`) no formato dd/mm/aaaa.", ephemeral=True
+                )
+                return
+            if start >= end:
+                await interaction.response.send_message("❌ O início precisa ser anterior ao fim.", ephemeral=True)
+                return
+        else:
+            start, end = now - WINDOWS[janela.value], now
+
+        await interaction.response.defer(ephemeral=True)
+        try:
+            report = await self.engine.report(target.name, start, end)
+        except Exception as e:
+            await interaction.followup.send(f"❌ Falha ao calcular uptime: {e}", ephemeral=True)
+            return
+        await interaction.followup.send(embed=self.build_uptime_embed(target, report), ephemeral=True)
+
+    @uptime_cmd.autocomplete("alvo")
+    async def uptime_alvo_autocomplete(self, interaction: discord.Interaction, current: str):
+        current = current.lower()
+        return [
+            app_commands.Choice(name=t.label, value=t.name)
+            for t in self.targets.values()
+            if current in t.name.lower() or current in t.label.lower()
+        ][:25]
+
+
+async def setup(bot):
+    await bot.add_cog(UptimeCog(bot))
@@ -0,0 +1 @@
+"""Infraestrutura compartilhada pelo bot e pelas cogs."""
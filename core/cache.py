@@ -0,0 +1,66 @@
+import asyncio
+import time
+
+
+class SingleFlight:
+    """
+    Coalescência de chamadas: enquanto uma chamada com a mesma chave está em
+    andamento, novas chamadas aguardam o mesmo resultado em vez de repeti-la.
+    """
+
+    def __init__(self):
+        self._calls = {}  # chave -> task em andamento
+
+    def _done(self, key, task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Evita o aviso de exceção não recuperada se todos os chamadores desistiram
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key, factory):
+        """Executa `factory()` (que retorna uma corrotina) ou se junta à execução em andamento"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        # Um chamador cancelado não cancela a execução compartilhada
+        return await asyncio.shield(task)
+
+    def in_flight(self, key) -> bool:
+        return key in self._calls
+
+
+class TTLCache:
+    """Cache em memória com expiração por tempo (time.monotonic)"""
+
+    def __init__(self, ttl: float, maxsize: int = 128):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}  # chave -> (expira em, valor)
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires, value = item
+        if time.monotonic() >= expires:
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key, value):
+        if key not in self._data and len(self._data) >= self.maxsize:
+            # Descarta o que expira primeiro
+            del self._data[min(self._data, key=lambda k: self._data[k][0])]
+        self._data[key] = (time.monotonic() + self.ttl, value)
+
+    def __len__(self):
+        return len(self._data)
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
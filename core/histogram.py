@@ -0,0 +1,162 @@
+import math
+
+# Razão entre limites consecutivos dos buckets: erro relativo máximo de ~2% nos percentis
+GAMMA = 1.04
+LOG_GAMMA = math.log(GAMMA)
+
+
+class LatencyHistogram:
+    """
+    Histograma de latências com buckets logarítmicos (estilo HDR/DDSketch).
+
+    Memória constante (poucas centenas de buckets entre 1ms e minutos), mesclável
+    por soma dos contadores e serializável para documentos do MongoDB. Apenas
+    valores positivos são registrados; verificações sem resposta não têm latência.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts = {}  # índice do bucket -> quantidade
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def bucket_of(value: float) -> int:
+        return math.ceil(math.log(value) / LOG_GAMMA)
+
+    @staticmethod
+    def bucket_value(index: int) -> float:
+        """Valor representativo do bucket (ponto médio entre os limites)"""
+        upper = GAMMA ** index
+        return 2 * upper / (GAMMA + 1)
+
+    def add(self, value: float, n: int = 1):
+        if not value or value <= 0:
+            return
+        index = self.bucket_of(value)
+        self.counts[index] = self.counts.get(index, 0) + n
+        self.count += n
+        self.total += value * n
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def add_bucket(self, index: int, n: int, total: float, min_value: float, max_value: float):
+        """Soma um bucket já agregado (por exemplo, vindo de um $group no MongoDB)"""
+        self.counts[index] = self.counts.get(index, 0) + n
+        self.count += n
+        self.total += total
+        self.min = min_value if self.min is None else min(self.min, min_value)
+        self.max = max_value if self.max is None else max(self.max, max_value)
+
+    def merge(self, other: "LatencyHistogram"):
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    @property
+    def avg(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, p: float):
+        """Percentil p (0-100) aproximado, limitado ao mínimo/máximo observados"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self.bucket_value(index), self.min), self.max)
+        return self.max
+
+    def percentiles(self) -> dict:
+        return {
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+    # -------------------- Serialização --------------------
+    def to_doc(self) -> dict:
+        return {
+            "buckets": [[index, n] for index, n in sorted(self.counts.items())],
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_doc(cls, doc) -> "LatencyHistogram":
+        hist = cls()
+        if not doc:
+            return hist
+        hist.counts = {int(index): n for index, n in doc.get("buckets", [])}
+        hist.count = doc.get("count", 0)
+        hist.total = doc.get("total", 0.0)
+        hist.min = doc.get("min")
+        hist.max = doc.get("max")
+        return hist
+
+
+class RollingHistogram:
+    """
+    Janela deslizante de latências: `slots` histogramas de `window / slots`
+    segundos cada, alinhados ao epoch. Slots que saem da janela são descartados,
+    então a memória é limitada a slots × buckets. Slots de 1h coincidem com os
+    buckets horários do status_logs_archive e usam os mesmos índices, podendo
+    ser mesclados com eles.
+    """
+
+    def __init__(self, window: float, slots: int):
+        self.window = window
+        self.slots = slots
+        self.slot_size = window / slots
+        self.ring = {}  # índice do slot -> LatencyHistogram
+
+    def _slot_of(self, ts: float) -> int:
+        return int(ts // self.slot_size)
+
+    def _expire(self, ts: float):
+        oldest = self._slot_of(ts) - self.slots + 1
+        for slot in [s for s in self.ring if s < oldest]:
+            del self.ring[slot]
+
+    def add(self, value: float, ts: float):
+        self._expire(ts)
+        slot = self._slot_of(ts)
+        if slot not in self.ring:
+            self.ring[slot] = LatencyHistogram()
+        self.ring[slot].add(value)
+
+    def snapshot(self, ts: float) -> LatencyHistogram:
+        """Histograma mesclado de todos os slots ainda dentro da janela"""
+        self._expire(ts)
+        merged = LatencyHistogram()
+        for hist in self.ring.values():
+            merged.merge(hist)
+        return merged
+
+    # -------------------- Serialização --------------------
+    def to_doc(self) -> dict:
+        return {
+            "slot_size": self.slot_size,
+            "slots": [[slot, hist.to_doc()] for slot, hist in sorted(self.ring.items())],
+        }
+
+    @classmethod
+    def from_doc(cls, doc, window: float, slots: int) -> "RollingHistogram":
+        rolling = cls(window, slots)
+        # Slots gravados com outro tamanho não são comparáveis: começa vazio
+        if doc and doc.get("slot_size") == rolling.slot_size:
+            rolling.ring = {int(slot): LatencyHistogram.from_doc(h) for slot, h in doc.get("slots", [])}
+        return rolling
@@ -0,0 +1,120 @@
+import os
+import time
+import aiohttp
+
+
+class RequestTimings:
+    """Marcações de tempo (perf_counter) de uma requisição, preenchidas pelo TraceConfig"""
+
+    __slots__ = ("start", "connect_start", "connect_end", "headers_sent", "end")
+
+    def __init__(self):
+        self.start = None
+        self.connect_start = None
+        self.connect_end = None
+        self.headers_sent = None
+        self.end = None
+
+    @staticmethod
+    def _ms(a, b) -> int:
+        if a is None or b is None:
+            return 0
+        return int((b - a) * 1000)
+
+    @property
+    def total(self) -> int:
+        """Tempo total até o recebimento dos headers da resposta (ms)"""
+        return self._ms(self.start, self.end)
+
+    @property
+    def connect(self) -> int:
+        """Tempo de DNS + TCP + TLS (ms). Zero quando a conexão foi reaproveitada do pool"""
+        return self._ms(self.connect_start, self.connect_end)
+
+    @property
+    def ttfb(self) -> int:
+        """Tempo entre o envio da requisição e o primeiro byte da resposta (ms)"""
+        return self._ms(self.headers_sent or self.connect_end or self.start, self.end)
+
+
+def _build_trace_config() -> aiohttp.TraceConfig:
+    def timings(ctx):
+        t = ctx.trace_request_ctx
+        return t if isinstance(t, RequestTimings) else None
+
+    async def on_request_start(session, ctx, params):
+        t = timings(ctx)
+        if t:
+            t.start = time.perf_counter()
+
+    async def on_connection_create_start(session, ctx, params):
+        t = timings(ctx)
+        if t:
+            t.connect_start = time.perf_counter()
+
+    async def on_connection_create_end(session, ctx, params):
+        t = timings(ctx)
+        if t:
+            t.connect_end = time.perf_counter()
+
+    async def on_request_headers_sent(session, ctx, params):
+        t = timings(ctx)
+        if t:
+            t.headers_sent = time.perf_counter()
+
+    async def on_request_end(session, ctx, params):
+        t = timings(ctx)
+        if t:
+            t.end = time.perf_counter()
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_connection_create_start.append(on_connection_create_start)
+    trace.on_connection_create_end.append(on_connection_create_end)
+    trace.on_request_headers_sent.append(on_request_headers_sent)
+    trace.on_request_end.append(on_request_end)
+    return trace
+
+
+class HttpClient:
+    """
+    Cliente HTTP único do bot: pool de conexões com keep-alive, cache de DNS
+    e limite de conexões por host. Criado no main.py e fechado no desligamento.
+    """
+
+    def __init__(self):
+        # Lidas aqui (e não no import) para respeitar o load_dotenv() do main.py
+        self.timeout = float(os.getenv("HTTP_TIMEOUT") or 10)  # Timeout total da requisição (s)
+        self.connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT") or 5)  # Timeout de conexão/TLS (s)
+        self.pool_limit = int(os.getenv("HTTP_POOL_LIMIT") or 100)  # Conexões simultâneas no pool
+        self.limit_per_host = int(os.getenv("HTTP_LIMIT_PER_HOST") or 10)  # Conexões simultâneas por host
+        self.dns_ttl = int(os.getenv("HTTP_DNS_TTL") or 300)  # Cache de DNS (s)
+        self.keepalive = float(os.getenv("HTTP_KEEPALIVE") or 30)  # Keep-alive das conexões ociosas (s)
+        self._session = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Sessão compartilhada, criada na primeira utilização (dentro do event loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl,
+                keepalive_timeout=self.keepalive,
+            )
+            timeout = aiohttp.ClientTimeout(total=self.timeout, sock_connect=self.connect_timeout)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=timeout,
+                trace_configs=[_build_trace_config()],
+            )
+        return self._session
+
+    def get(self, url: str, timings: RequestTimings = None, **kwargs):
+        """Atalho para session.get que preenche `timings` quando informado"""
+        return self.session.get(url, trace_request_ctx=timings, **kwargs)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,105 @@
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+
+# Atributos padrão de um LogRecord; o que sobra veio de extra= e vira campo do JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro: ts, level, logger, msg e os campos passados em extra="""
+
+    def format(self, record) -> str:
+        doc = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key != "sample_key" and value is not None:
+                doc[key] = value
+        if record.exc_text:
+            doc["exc"] = record.exc_text
+        return json.dumps(doc, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Enfileira o registro com a mensagem já montada, preservando os campos de extra="""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Amostragem de linhas repetitivas: registros com `sample_key` em extra= só
+    passam na primeira ocorrência e depois a cada `every` ocorrências da mesma
+    chave. Os demais registros passam sempre.
+    """
+
+    def __init__(self, every: int = 10):
+        super().__init__()
+        self.every = max(1, every)
+        self._seen = {}  # sample_key -> ocorrências
+
+    def filter(self, record) -> bool:
+        key = getattr(record, "sample_key", None)
+        if key is None:
+            return True
+        seen = self._seen.get(key, 0)
+        self._seen[key] = seen + 1
+        if seen % self.every:
+            return False
+        if seen:
+            record.sampled = self.every
+        return True
+
+
+def parse_levels(text: str) -> dict:
+    """'cogs.status=WARNING,discord=INFO' -> {"cogs.status": "WARNING", "discord": "INFO"}"""
+    levels = {}
+    for item in (text or "").split(","):
+        name, sep, level = item.partition("=")
+        if sep and name.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Envia todos os logs (do bot e do discord.py) para uma fila. Uma thread
+    separada formata em JSON e escreve no stdout, então uma escrita lenta
+    (driver de log do Docker, pipe cheio) nunca bloqueia o event loop.
+
+    LOG_LEVEL define o nível geral e LOG_LEVELS o de cada logger/cog;
+    LOG_SAMPLE_EVERY controla a amostragem das linhas por verificação.
+    """
+    log_queue = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    # Amostra antes de enfileirar: o que é descartado não custa nada ao loop
+    queue_handler.addFilter(SamplingFilter(int(os.getenv("LOG_SAMPLE_EVERY") or 10)))
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter())
+    listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(os.getenv("LOG_LEVEL", "").upper() or "INFO")
+    for name, level in parse_levels(os.getenv("LOG_LEVELS")).items():
+        logging.getLogger(name).setLevel(level)
+
+    listener.start()
+    return listener
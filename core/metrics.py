@@ -0,0 +1,291 @@
+import logging
+import re
+import threading
+import time
+
+import aiohttp
+from pymongo import monitoring
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Limites padrão dos histogramas de duração (s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels_text(names, values, extra=()) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    pairs += [f'{n}="{_escape(v)}"' for n, v in extra]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# -------------------- Métricas --------------------
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}  # tupla de valores dos rótulos -> valor
+        # Os listeners do pymongo rodam nas threads do Motor
+        self._lock = threading.Lock()
+
+    def _key(self, labels) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value) -> list:
+        return [f"{self.name}{_labels_text(self.label_names, key)} {_number(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def _render_value(self, key, value) -> list:
+        counts, total = value
+        lines, cumulative = [], 0
+        for upper, n in zip(self.buckets, counts):
+            cumulative += n
+            labels = _labels_text(self.label_names, key, (("le", _number(upper)),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _labels_text(self.label_names, key)
+        lines.append(f"{self.name}_sum{labels} {_number(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Conjunto de métricas exportadas no formato texto do Prometheus/OpenMetrics"""
+
+    def __init__(self):
+        self.metrics = []
+        self._collectors = []  # callbacks executados a cada coleta (gauges calculados na hora)
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()) -> Gauge:
+        return self.register(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def on_collect(self, callback):
+        self._collectors.append(callback)
+
+    def remove_collector(self, callback):
+        if callback in self._collectors:
+            self._collectors.remove(callback)
+
+    def render(self) -> str:
+        for callback in list(self._collectors):
+            try:
+                callback()
+            except Exception as e:
+                log.warning("⚠️ Falha ao coletar métrica: %s", e)
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# -------------------- Métricas do bot --------------------
+PROBE_DURATION = REGISTRY.histogram(
+    "kookie_probe_duration_seconds", "Duração das verificações de status", ("target",)
+)
+PROBE_RESULTS = REGISTRY.counter(
+    "kookie_probe_results_total", "Resultados das verificações de status", ("target", "outcome")
+)
+MONGO_DURATION = REGISTRY.histogram(
+    "kookie_mongo_command_duration_seconds", "Duração dos comandos do MongoDB", ("collection", "command")
+)
+MONGO_FAILURES = REGISTRY.counter(
+    "kookie_mongo_command_failures_total", "Comandos do MongoDB que falharam", ("collection", "command")
+)
+DISCORD_REST_DURATION = REGISTRY.histogram(
+    "kookie_discord_rest_duration_seconds", "Duração das chamadas REST ao Discord", ("method", "resource", "status")
+)
+DISCORD_RATE_LIMITED = REGISTRY.counter(
+    "kookie_discord_rate_limited_total", "Respostas 429 do Discord", ("resource", "scope")
+)
+GATEWAY_LATENCY = REGISTRY.gauge(
+    "kookie_gateway_latency_seconds", "Latência do heartbeat do gateway (bot.latency)"
+)
+LOOP_LAG = REGISTRY.histogram(
+    "kookie_task_loop_lag_seconds", "Atraso entre o horário agendado e o início de cada iteração", ("loop",)
+)
+COMMAND_DURATION = REGISTRY.histogram(
+    "kookie_app_command_duration_seconds", "Tempo entre a interação e o fim do comando de barra", ("command", "outcome")
+)
+
+
+# -------------------- Atraso das tarefas periódicas --------------------
+class LoopLagTracker:
+    """Mede o atraso de um loop de intervalo fixo (tasks.loop) a cada iteração"""
+
+    def __init__(self, name: str, interval: float):
+        self.name = name
+        self.interval = interval
+        self._last = None
+
+    def tick(self):
+        now = time.monotonic()
+        if self._last is not None:
+            LOOP_LAG.observe(max(0.0, now - self._last - self.interval), loop=self.name)
+        self._last = now
+
+
+# -------------------- MongoDB --------------------
+class MongoCommandListener(monitoring.CommandListener):
+    """Duração de cada comando do MongoDB por coleção (passado em event_listeners do cliente)"""
+
+    def __init__(self):
+        self._pending = {}  # (conexão, request_id) -> coleção
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else event.database_name
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = collection
+
+    def _finish(self, event):
+        with self._lock:
+            return self._pending.pop((event.connection_id, event.request_id), "")
+
+    def succeeded(self, event):
+        collection = self._finish(event)
+        MONGO_DURATION.observe(event.duration_micros / 1e6, collection=collection, command=event.command_name)
+
+    def failed(self, event):
+        collection = self._finish(event)
+        MONGO_DURATION.observe(event.duration_micros / 1e6, collection=collection, command=event.command_name)
+        MONGO_FAILURES.inc(collection=collection, command=event.command_name)
+
+
+# -------------------- Discord REST --------------------
+_API_PREFIX = re.compile(r"^/api(/v\d+)?")
+
+
+def discord_resource(path: str) -> str:
+    """Primeiro segmento da rota (channels, interactions, webhooks...), sem ids nem tokens"""
+    path = _API_PREFIX.sub("", path)
+    return path.strip("/").split("/", 1)[0] or "/"
+
+
+def discord_trace_config() -> aiohttp.TraceConfig:
+    """TraceConfig para o http_trace do bot: mede toda chamada REST, inclusive as que voltam 429"""
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        ctx.start = time.perf_counter()
+
+    async def on_request_end(session, ctx, params):
+        resource = discord_resource(params.url.path)
+        status = params.response.status
+        DISCORD_REST_DURATION.observe(
+            time.perf_counter() - ctx.start, method=params.method, resource=resource, status=status
+        )
+        if status == 429:
+            scope = params.response.headers.get("X-RateLimit-Scope", "user")
+            DISCORD_RATE_LIMITED.inc(resource=resource, scope=scope)
+
+    async def on_request_exception(session, ctx, params):
+        DISCORD_REST_DURATION.observe(
+            time.perf_counter() - ctx.start,
+            method=params.method,
+            resource=discord_resource(params.url.path),
+            status="error",
+        )
+
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    return trace
+
+
+# -------------------- Servidor HTTP --------------------
+class MetricsServer:
+    """Endpoint /metrics servido pelo próprio event loop do bot"""
+
+    def __init__(self, registry: Registry, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def handle(self, request):
+        from aiohttp import web
+        return web.Response(body=self.registry.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+    async def start(self):
+        # aiohttp.web só é importado quando o endpoint é de fato aberto
+        from aiohttp import web
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        log.info(f"📈 Métricas disponíveis em http://{self.host}:{self.port}/metrics")
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
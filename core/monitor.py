@@ -0,0 +1,270 @@
+import asyncio
+import heapq
+import json
+import logging
+import os
+import random
+
+from core.metrics import LOOP_LAG
+
+log = logging.getLogger(__name__)
+
+# Padrões do motor de monitoramento, compartilhados pelo StatusCog (agendamento) e
+# pelo UptimeCog/rollup (tempo coberto por cada amostra)
+STATUS_INTERVAL = float(os.getenv("STATUS_INTERVAL") or 60)  # Intervalo entre verificações enquanto estável (s)
+STATUS_FAST_INTERVAL = float(os.getenv("STATUS_FAST_INTERVAL") or 5)  # Reverificação após uma falha (s)
+STATUS_CONFIRM_FAILURES = int(os.getenv("STATUS_CONFIRM_FAILURES") or 3)  # Falhas seguidas antes de declarar OFFLINE
+STATUS_BACKOFF_MAX = float(os.getenv("STATUS_BACKOFF_MAX") or 120)  # Intervalo máximo durante quedas longas (s)
+STATUS_JITTER = float(os.getenv("STATUS_JITTER") or 0.1)  # Variação aleatória dos intervalos (fração)
+STATUS_SAMPLE_MAX_GAP = float(os.getenv("STATUS_SAMPLE_MAX_GAP") or max(STATUS_INTERVAL, STATUS_BACKOFF_MAX) * 3)  # Tempo máximo coberto por uma amostra (s)
+
+
+def sample_max_gap(target) -> float:
+    """
+    Tempo máximo coberto por uma amostra do alvo: três vezes o maior intervalo
+    que o agendamento dele pode usar (intervalo estável ou teto do backoff,
+    considerando os valores próprios do alvo), nunca abaixo de STATUS_SAMPLE_MAX_GAP.
+    """
+    interval = target.interval or STATUS_INTERVAL
+    backoff_max = target.backoff_max or STATUS_BACKOFF_MAX
+    return max(STATUS_SAMPLE_MAX_GAP, max(interval, backoff_max) * 3)
+
+
+class Target:
+    """
+    Alvo monitorado: nome (chave do estado no MongoDB), URL e rótulo exibido no embed.
+    Os parâmetros de agendamento não informados usam os padrões do MonitorEngine.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        label: str = None,
+        interval: float = None,
+        fast_interval: float = None,
+        confirm: int = None,
+        backoff_max: float = None,
+    ):
+        self.name = name
+        self.url = url
+        self.label = label or name
+        self.interval = interval  # Intervalo enquanto estável (s)
+        self.fast_interval = fast_interval  # Reverificação após uma falha (s)
+        self.confirm = confirm  # Falhas seguidas antes de declarar OFFLINE
+        self.backoff_max = backoff_max  # Intervalo máximo durante quedas longas (s)
+
+    def __repr__(self):
+        return f"Target({self.name!r}, {self.url!r})"
+
+
+def load_targets(default_url: str = None) -> list:
+    """
+    Lê a lista de alvos de KOOKIE_STATUS_TARGETS (JSON), por exemplo:
+    [{"name": "kookie", "label": "Kookie", "url": "https://kookie.app"},
+     {"name": "api", "label": "API", "url": "https://api.kookie.app/health",
+      "interval": 120, "fast_interval": 10, "confirm": 2, "backoff_max": 300}]
+    Sem a variável, monitora apenas KOOKIE_STATUS_URL sob o nome "kookie".
+    """
+    raw = os.getenv("KOOKIE_STATUS_TARGETS")
+    if not raw:
+        if not default_url:
+            return []
+        return [Target("kookie", default_url, label="Kookie")]
+
+    targets = []
+    for item in json.loads(raw):
+        targets.append(Target(
+            item["name"],
+            item["url"],
+            label=item.get("label"),
+            interval=item.get("interval"),
+            fast_interval=item.get("fast_interval"),
+            confirm=item.get("confirm"),
+            backoff_max=item.get("backoff_max"),
+        ))
+
+    names = [t.name for t in targets]
+    if len(names) != len(set(names)):
+        raise ValueError("❌ KOOKIE_STATUS_TARGETS possui nomes de alvos repetidos!")
+    return targets
+
+
+def is_up(result) -> bool:
+    return bool(result and result.get("online"))
+
+
+class MonitorEngine:
+    """
+    Agenda as verificações de vários alvos em um único event loop, com intervalo
+    adaptativo por alvo.
+
+    Enquanto o alvo está estável ele é verificado no intervalo lento. Após uma
+    falha passa para reverificações rápidas e só depois de `confirm` falhas seguidas
+    o resultado é entregue a on_result (as falhas ainda não confirmadas não mudam o
+    estado; `on_sample`, se informado, recebe todos os resultados, inclusive essas
+    falhas, para o histórico). Em quedas longas o intervalo cresce exponencialmente
+    até `backoff_max`.
+    Todo intervalo recebe um jitter de ±`jitter` para que os alvos não se alinhem.
+
+    Cada alvo tem um prazo absoluto (loop.time()) em um heap; o próximo prazo é
+    calculado quando a verificação termina, a partir do prazo anterior, então uma
+    verificação nunca se sobrepõe à seguinte. Os alvos começam espalhados ao longo
+    do primeiro intervalo e o semáforo limita quantas verificações rodam ao mesmo tempo.
+    """
+
+    def __init__(
+        self,
+        targets,
+        probe,
+        on_result,
+        interval: float = 60,
+        concurrency: int = 20,
+        fast_interval: float = 5,
+        confirm: int = 3,
+        backoff_max: float = 120,
+        jitter: float = 0.1,
+        on_sample=None,
+    ):
+        self.targets = list(targets)
+        self.probe = probe  # async (target) -> resultado
+        self.on_result = on_result  # async (target, resultado) -> None
+        self.on_sample = on_sample  # (target, resultado) -> None, para toda verificação
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.confirm = max(1, confirm)
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+        self._task = None
+        self._running = {}  # nome do alvo -> task da verificação em andamento
+        self._failures = {}  # nome do alvo -> falhas seguidas
+        self._heap = []
+        self._wakeup = asyncio.Event()
+
+    # -------------------- Política de agendamento --------------------
+    def interval_for(self, target) -> float:
+        return target.interval or self.interval
+
+    def confirm_for(self, target) -> int:
+        return max(1, target.confirm or self.confirm)
+
+    def next_delay(self, target) -> float:
+        """Espera até a próxima verificação, de acordo com as falhas seguidas do alvo"""
+        failures = self._failures.get(target.name, 0)
+        confirm = self.confirm_for(target)
+        fast = target.fast_interval or self.fast_interval
+
+        if failures == 0:
+            delay = self.interval_for(target)
+        elif failures < confirm:
+            delay = fast
+        else:
+            # Queda confirmada: dobra a cada nova falha até o teto
+            delay = min(fast * 2 ** (failures - confirm + 1), target.backoff_max or self.backoff_max)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    # -------------------- Ciclo de vida --------------------
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.is_running():
+            return
+        self._task = asyncio.create_task(self._run(), name="monitor-engine")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        pending = list(self._running.values())
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._running.clear()
+
+    def _schedule(self, due, seq, target):
+        heapq.heappush(self._heap, (due, seq, target))
+        self._wakeup.set()
+
+    async def _check(self, target, due, seq):
+        loop = asyncio.get_running_loop()
+        try:
+            async with self.semaphore:
+                try:
+                    result = await self.probe(target)
+                except Exception:
+                    result = None
+
+                if self.on_sample is not None:
+                    self.on_sample(target, result)
+
+                if is_up(result):
+                    self._failures.pop(target.name, None)
+                else:
+                    self._failures[target.name] = self._failures.get(target.name, 0) + 1
+
+                failures = self._failures.get(target.name, 0)
+                confirm = self.confirm_for(target)
+                if 0 < failures < confirm:
+                    log.info(
+                        f"🟡 Falha {failures}/{confirm} em '{target.name}'. Reverificando antes de declarar OFFLINE.",
+                        extra={"target": target.name, "failures": failures},
+                    )
+                else:
+                    await self.on_result(target, result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning(f"⚠️ Falha ao processar verificação de '{target.name}': %s", e)
+        finally:
+            self._running.pop(target.name, None)
+
+        # Próximo prazo a partir do anterior; se já passou (loop parado), conta a partir de agora
+        delay = self.next_delay(target)
+        next_due = due + delay
+        now = loop.time()
+        if next_due <= now:
+            next_due = now + delay
+        self._schedule(next_due, seq, target)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        # Espalha o início dos alvos ao longo do primeiro intervalo
+        self._heap = []
+        count = len(self.targets)
+        for i, target in enumerate(self.targets):
+            offset = self.interval_for(target) * i / count
+            self._heap.append((start + offset, i, target))
+        heapq.heapify(self._heap)
+
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                # Todos os alvos em verificação: espera algum reagendar
+                await self._wakeup.wait()
+                continue
+
+            due, seq, target = self._heap[0]
+            delay = due - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            LOOP_LAG.observe(-delay, loop="monitor")
+            self._running[target.name] = asyncio.create_task(
+                self._check(target, due, seq), name=f"monitor-{target.name}"
+            )
@@ -0,0 +1,128 @@
+import logging
+import os
+import re
+from datetime import datetime
+
+log = logging.getLogger(__name__)
+
+# Seletores da página de anúncios (ajuste conforme o HTML real do site)
+ITEM_CLASS = "announcement-item"
+TITLE_CLASS = "announcement-title"
+DESCRIPTION_CLASS = "announcement-description"
+DATE_CLASS = "announcement-date"
+
+
+def build_update(title, description, date_text) -> dict:
+    title = title.strip() if title else "Sem título"
+    description = description.strip() if description else "Sem descrição"
+    date_text = date_text.strip() if date_text else None
+
+    try:
+        date = datetime.strptime(date_text, "%d/%m/%Y") if date_text else datetime.utcnow()
+    except Exception:
+        date = datetime.utcnow()
+
+    return {"title": title, "description": description, "date": date}
+
+
+# -------------------- Backends --------------------
+def parse_selectolax(text: str, limit: int) -> list:
+    from selectolax.lexbor import LexborHTMLParser
+
+    def text_of(node, cls):
+        elem = node.css_first(f".{cls}")
+        return elem.text() if elem else None
+
+    updates = []
+    for item in LexborHTMLParser(text).css(f".{ITEM_CLASS}"):
+        if len(updates) >= limit:
+            break
+        updates.append(build_update(
+            text_of(item, TITLE_CLASS), text_of(item, DESCRIPTION_CLASS), text_of(item, DATE_CLASS)
+        ))
+    return updates
+
+
+def parse_lxml(text: str, limit: int) -> list:
+    import lxml.html
+
+    def has_class(cls):
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+    def text_of(node, cls):
+        found = node.xpath(f".//*[{has_class(cls)}]")
+        return found[0].text_content() if found else None
+
+    updates = []
+    root = lxml.html.fromstring(text)
+    for item in root.xpath(f"//*[{has_class(ITEM_CLASS)}]"):
+        if len(updates) >= limit:
+            break
+        updates.append(build_update(
+            text_of(item, TITLE_CLASS), text_of(item, DESCRIPTION_CLASS), text_of(item, DATE_CLASS)
+        ))
+    return updates
+
+
+# Início da tag de um anúncio no HTML bruto
+_ITEM_TAG = re.compile(rf"""<[a-zA-Z][^>]*?\bclass\s*=\s*["'][^"']*(?<![\w-]){re.escape(ITEM_CLASS)}(?![\w-])""")
+
+
+def item_region(text: str, limit: int) -> str:
+    """Trecho do HTML que vai do primeiro anúncio até o início do anúncio `limit + 1`"""
+    starts = []
+    for match in _ITEM_TAG.finditer(text):
+        starts.append(match.start())
+        if len(starts) > limit:
+            break
+    if not starts:
+        return ""
+    return text[starts[0]:starts[limit]] if len(starts) > limit else text[starts[0]:]
+
+
+def parse_bs4(text: str, limit: int) -> list:
+    """
+    Fallback puro Python: só o trecho com os primeiros `limit` anúncios é
+    entregue ao BeautifulSoup, e o SoupStrainer monta apenas a árvore deles.
+    """
+    from bs4 import BeautifulSoup, SoupStrainer
+
+    def text_of(node, cls):
+        elem = node.find(class_=cls)
+        return elem.get_text() if elem else None
+
+    # Durante a análise o atributo class ainda é a string bruta ("announcement-item card")
+    strainer = SoupStrainer(class_=re.compile(rf"(^|\s){re.escape(ITEM_CLASS)}(\s|$)"))
+    soup = BeautifulSoup(item_region(text, limit), "html.parser", parse_only=strainer)
+    return [
+        build_update(text_of(item, TITLE_CLASS), text_of(item, DESCRIPTION_CLASS), text_of(item, DATE_CLASS))
+        for item in soup.find_all(class_=ITEM_CLASS, limit=limit)
+    ]
+
+
+BACKENDS = {
+    "selectolax": ("selectolax", parse_selectolax),
+    "lxml": ("lxml", parse_lxml),
+    "bs4": ("bs4", parse_bs4),
+}
+
+
+def available_backends() -> list:
+    """Backends cujo pacote está instalado, em ordem de preferência"""
+    import importlib.util
+    return [name for name, (module, _) in BACKENDS.items() if importlib.util.find_spec(module)]
+
+
+def get_parser(name: str = None):
+    """
+    Escolhe o backend pelo nome (ou por SCRAPER_PARSER). "auto"/vazio usa o
+    mais rápido instalado: selectolax, lxml e, por fim, BeautifulSoup.
+    """
+    name = (name or os.getenv("SCRAPER_PARSER") or "auto").lower()
+    available = available_backends()
+    if name == "auto":
+        name = available[0]
+    elif name not in available:
+        log.warning(f"⚠️ Parser '{name}' indisponível. Usando '{available[0]}'.")
+        name = available[0]
+    return name, BACKENDS[name][1]
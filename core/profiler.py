@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import re
+import sys
+import threading
+import time
+import traceback
+
+from core.histogram import RollingHistogram
+from core.metrics import LOOP_LAG
+
+log = logging.getLogger(__name__)
+
+_ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+_CORO = re.compile(r"coro=<(.+?) (?:running|done), defined at ([^>]+)>|coro=<(.+?) running at ([^>]+)>")
+
+
+def describe_handle(text: str) -> str:
+    """Nome estável de um callback/task lento a partir do repr que o asyncio registra"""
+    match = _CORO.search(text)
+    if match:
+        name = match.group(1) or match.group(3)
+        where = (match.group(2) or match.group(4)).rsplit("/", 1)[-1]
+        return f"{name} @ {where}"
+    return _ADDRESS.sub("", text)[:160]
+
+
+class _SlowCallbackHandler(logging.Handler):
+    """Recebe os avisos 'Executing <Handle> took X seconds' do modo debug do asyncio"""
+
+    def __init__(self, profiler):
+        super().__init__(logging.WARNING)
+        self.profiler = profiler
+
+    def emit(self, record):
+        if isinstance(record.msg, str) and record.msg.startswith("Executing") and len(record.args or ()) == 2:
+            handle, seconds = record.args
+            self.profiler.record_slow_callback(describe_handle(str(handle)), seconds)
+
+
+class LoopProfiler:
+    """
+    Modo de profiling do event loop (opcional, ligado por PROFILE no main.py).
+
+    - mede continuamente o atraso do loop com uma task que dorme `interval`
+      segundos e compara o horário em que acordou com o esperado;
+    - liga o modo debug do asyncio com slow_callback_duration = `threshold`, e
+      agrega por callback os avisos de execuções lentas;
+    - uma thread de vigia amostra a pilha da thread do loop sempre que ele fica
+      travado por mais de `threshold`, apontando a linha que está bloqueando.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.25, max_entries: int = 200):
+        self.threshold = threshold
+        self.interval = interval
+        self.max_entries = max_entries
+
+        self.lag = RollingHistogram(3600, 12)  # atraso do loop na última hora (ms)
+        self.max_lag = 0.0
+        self.slow_callbacks = {}  # descrição -> [quantidade, total (s), pior (s)]
+        self.stacks = {}  # pilha resumida -> [amostras, pior travamento (s)]
+        self.started_at = None
+
+        self._loop = None
+        self._loop_thread = None
+        self._deadline = None  # time.monotonic() em que a task de medição deveria acordar
+        self._task = None
+        self._watchdog = None
+        self._stop = threading.Event()
+        self._handler = _SlowCallbackHandler(self)
+        self._lock = threading.Lock()
+
+    # -------------------- Ciclo de vida --------------------
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._loop.set_debug(True)
+        self._loop.slow_callback_duration = self.threshold
+        logging.getLogger("asyncio").addHandler(self._handler)
+
+        self.started_at = time.time()
+        self._deadline = time.monotonic() + self.interval
+        self._task = asyncio.create_task(self._measure(), name="loop-profiler")
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="loop-profiler-watchdog", daemon=True)
+        self._watchdog.start()
+        log.info(
+            f"🔬 Profiling do event loop ativo (limite {self.threshold * 1000:.0f}ms, "
+            f"medição a cada {self.interval * 1000:.0f}ms)."
+        )
+
+    async def stop(self):
+        self._stop.set()
+        logging.getLogger("asyncio").removeHandler(self._handler)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._loop is not None:
+            self._loop.set_debug(False)
+
+    # -------------------- Medição --------------------
+    async def _measure(self):
+        while True:
+            self._deadline = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._deadline)
+            LOOP_LAG.observe(lag, loop="event_loop")
+            if lag > 0:
+                self.lag.add(lag * 1000, time.time())
+            self.max_lag = max(self.max_lag, lag)
+
+    def _watch(self):
+        # Amostra com frequência maior que o limite para pegar travamentos curtos
+        period = self.threshold / 2
+        while not self._stop.wait(period):
+            stalled = time.monotonic() - self._deadline
+            if stalled < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self.record_stack(frame, stalled)
+
+    def record_stack(self, frame, stalled: float):
+        frames = traceback.extract_stack(frame)[-6:]
+        # Loop parado no select() está ocioso, não travado (a medição só ainda não acordou)
+        if frames and frames[-1].filename.endswith("selectors.py"):
+            return
+        key = tuple(f"{f.filename.rsplit('/', 1)[-1]}:{f.lineno} {f.name}" for f in frames)
+        with self._lock:
+            entry = self.stacks.get(key)
+            if entry is None:
+                if len(self.stacks) >= self.max_entries:
+                    return
+                entry = self.stacks[key] = [0, 0.0]
+            entry[0] += 1
+            entry[1] = max(entry[1], stalled)
+
+    def record_slow_callback(self, name: str, seconds: float):
+        with self._lock:
+            entry = self.slow_callbacks.get(name)
+            if entry is None:
+                if len(self.slow_callbacks) >= self.max_entries:
+                    return
+                entry = self.slow_callbacks[name] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    # -------------------- Resumo --------------------
+    def summary(self, top: int = 5) -> dict:
+        with self._lock:
+            callbacks = sorted(self.slow_callbacks.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+            stacks = sorted(self.stacks.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+        return {
+            "since": self.started_at,
+            "lag": self.lag.snapshot(time.time()).percentiles(),
+            "max_lag": self.max_lag,
+            "slow_callbacks": callbacks,
+            "stacks": stacks,
+        }
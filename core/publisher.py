@@ -0,0 +1,68 @@
+import time
+
+
+def embed_signature(embed, volatile=()) -> tuple:
+    """
+    Representação comparável do que o embed mostra, ignorando os campos
+    voláteis (contadores e horários que mudam a cada verificação).
+    """
+    data = embed.to_dict()
+    fields = tuple(
+        (f.get("name"), f.get("value"), f.get("inline"))
+        for f in data.get("fields", [])
+        if f.get("name") not in volatile
+    )
+    return (data.get("title"), data.get("description"), data.get("url"), data.get("color"), fields)
+
+
+class EmbedPublisher:
+    """
+    Diff de renderização das mensagens fixas de status.
+
+    Guarda, por chave, o objeto de mensagem já conhecido (evitando fetch_message)
+    e a assinatura do último embed enviado. Uma edição só é feita quando algum
+    campo visível muda, quando o intervalo mínimo de atualização já passou ou
+    quando ela é forçada (transição de estado).
+    """
+
+    def __init__(self, min_refresh: float = 300, volatile=()):
+        self.min_refresh = min_refresh
+        self.volatile = frozenset(volatile)
+
+        self._messages = {}  # chave -> discord.Message / PartialMessage
+        self._signatures = {}  # chave -> (assinatura completa, assinatura sem voláteis)
+        self._edited_at = {}  # chave -> time.monotonic() da última edição
+
+    # -------------------- Cache de mensagens --------------------
+    def message(self, key):
+        return self._messages.get(key)
+
+    def cached_messages(self) -> int:
+        return len(self._messages)
+
+    def forget(self, key):
+        """Descarta a mensagem em cache (apagada, inacessível ou trocada)"""
+        self._messages.pop(key, None)
+        self._signatures.pop(key, None)
+        self._edited_at.pop(key, None)
+
+    # -------------------- Decisão --------------------
+    def should_edit(self, key, embed, force: bool = False) -> bool:
+        if key not in self._messages or force:
+            return True
+        last = self._signatures.get(key)
+        if last is None:
+            return True
+
+        full = embed_signature(embed)
+        if full == last[0]:
+            return False  # Nada mudou
+        if embed_signature(embed, self.volatile) != last[1]:
+            return True  # Campo visível relevante mudou
+        return time.monotonic() - self._edited_at.get(key, 0) >= self.min_refresh
+
+    def sent(self, key, message, embed):
+        """Registra a mensagem e o embed que acabaram de ser enviados/editados"""
+        self._messages[key] = message
+        self._signatures[key] = (embed_signature(embed), embed_signature(embed, self.volatile))
+        self._edited_at[key] = time.monotonic()
@@ -0,0 +1,74 @@
+import os
+
+import discord
+from discord.ext import commands
+
+
+def parse_intents(text: str) -> discord.Intents:
+    """
+    Lista separada por vírgulas. "minimal" (padrão) liga só guilds, o suficiente
+    para comandos de barra e bot.get_channel; "default" parte de
+    discord.Intents.default(); os demais nomes ligam o intent correspondente,
+    ex. "minimal,message_content".
+    """
+    intents = discord.Intents(guilds=True)
+    for name in (text or "minimal").lower().split(","):
+        name = name.strip()
+        if name in ("", "minimal"):
+            continue
+        if name == "default":
+            intents |= discord.Intents.default()
+        elif name in discord.Intents.VALID_FLAGS:
+            setattr(intents, name, True)
+        else:
+            raise ValueError(f"❌ Intent desconhecido em BOT_INTENTS: {name}")
+    return intents
+
+
+def parse_shard_ids(text: str):
+    """'0,2,5' ou '0-3' -> lista de shards; vazio -> None (todos)"""
+    if not text:
+        return None
+    ids = []
+    for part in text.split(","):
+        start, sep, end = part.strip().partition("-")
+        if sep:
+            ids.extend(range(int(start), int(end) + 1))
+        elif start:
+            ids.append(int(start))
+    return ids
+
+
+def build_bot(**kwargs) -> commands.Bot:
+    """
+    Cria o bot com o perfil de execução das variáveis de ambiente:
+
+    BOT_INTENTS       intents do gateway (veja parse_intents)
+    BOT_MAX_MESSAGES  mensagens mantidas em cache (0 desativa; padrão 0)
+    BOT_MEMBER_CACHE  "none" (padrão) ou "default" para MemberCacheFlags
+    BOT_SHARDED       1 usa AutoShardedBot
+    BOT_SHARD_COUNT   total de shards (vazio: o Discord recomenda)
+    BOT_SHARD_IDS     shards deste processo, ex. "0-3" ou "4,5"
+    """
+    intents = parse_intents(os.getenv("BOT_INTENTS"))
+    max_messages = int(os.getenv("BOT_MAX_MESSAGES") or 0) or None
+    if (os.getenv("BOT_MEMBER_CACHE") or "none").lower() == "default":
+        member_cache = discord.MemberCacheFlags.from_intents(intents)
+    else:
+        member_cache = discord.MemberCacheFlags.none()
+
+    options = dict(
+        intents=intents,
+        max_messages=max_messages,
+        member_cache_flags=member_cache,
+        chunk_guilds_at_startup=False,
+        **kwargs,
+    )
+
+    if (os.getenv("BOT_SHARDED") or "").lower() in ("1", "true", "on"):
+        shard_count = int(os.getenv("BOT_SHARD_COUNT") or 0) or None
+        shard_ids = parse_shard_ids(os.getenv("BOT_SHARD_IDS"))
+        if shard_ids is not None and shard_count is None:
+            raise ValueError("❌ BOT_SHARD_IDS exige BOT_SHARD_COUNT definido!")
+        return commands.AutoShardedBot(shard_count=shard_count, shard_ids=shard_ids, **options)
+    return commands.Bot(**options)
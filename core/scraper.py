@@ -0,0 +1,85 @@
+import asyncio
+import hashlib
+import logging
+
+from core.parsers import get_parser
+
+log = logging.getLogger(__name__)
+
+
+class AnnouncementsScraper:
+    """
+    Raspagem da página de anúncios com GET condicional.
+
+    Guarda ETag/Last-Modified da última resposta e os reenvia como
+    If-None-Match/If-Modified-Since. Em um 304, ou quando o corpo tem o mesmo
+    hash da última página processada, o HTML não é analisado e fetch() devolve None.
+    Os validadores de uma página nova só passam a valer em commit(), chamado
+    depois que os anúncios foram gravados; se a gravação falhar, a próxima
+    raspagem analisa a mesma página de novo.
+    O backend de análise vem de core.parsers (selectolax, lxml ou BeautifulSoup).
+    """
+
+    def __init__(self, http, url: str, parser: str = None):
+        self.http = http
+        self.url = url
+        self.parser_name, self.parse = get_parser(parser)
+
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+        self.parsed_limit = 0  # Quantos anúncios a última análise extraiu
+        self._pending = None  # (etag, last_modified, body_hash, limit) aguardando commit()
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    async def fetch(self, limit: int = 5):
+        """
+        Retorna a lista de anúncios, [] em caso de erro, ou None se a página
+        não mudou desde a última análise (com pelo menos `limit` anúncios).
+        """
+        # Um limite maior que o já analisado exige analisar a página de novo
+        can_skip = limit <= self.parsed_limit
+        headers = self.conditional_headers() if can_skip else {}
+
+        try:
+            async with self.http.get(self.url, headers=headers) as resp:
+                if resp.status == 304:
+                    return None
+                if resp.status != 200:
+                    log.warning(f"⚠️ Não foi possível acessar a página de updates (HTTP {resp.status})")
+                    return []
+
+                body = await resp.read()
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+                charset = resp.get_encoding()
+        except Exception as e:
+            log.error(f"❌ Erro ao buscar updates: {e}")
+            return []
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        if can_skip and body_hash == self.body_hash:
+            # Mesma página já gravada: os validadores novos podem valer desde já
+            self.etag = etag
+            self.last_modified = last_modified
+            return None
+
+        # A análise roda fora do event loop para não atrasar o heartbeat do gateway
+        text = body.decode(charset, errors="replace")
+        updates = await asyncio.get_running_loop().run_in_executor(None, self.parse, text, limit)
+        self._pending = (etag, last_modified, body_hash, limit)
+        return updates
+
+    def commit(self):
+        """Confirma a última página analisada depois que os anúncios dela foram gravados"""
+        if self._pending is None:
+            return
+        self.etag, self.last_modified, self.body_hash, self.parsed_limit = self._pending
+        self._pending = None
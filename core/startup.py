@@ -0,0 +1,79 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from discord import AppCommandType
+
+log = logging.getLogger(__name__)
+
+
+class PhaseTimer:
+    """Cronometra as fases da inicialização para o resumo exibido quando o bot fica pronto"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}  # nome -> duração (s)
+        self._open = {}  # nome -> início da fase em andamento
+
+    def begin(self, name: str):
+        self._open[name] = time.perf_counter()
+
+    def end(self, name: str):
+        start = self._open.pop(name, None)
+        if start is not None:
+            self.phases[name] = time.perf_counter() - start
+
+    @contextmanager
+    def phase(self, name: str):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def summary(self) -> str:
+        parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in self.phases.items()]
+        total = time.perf_counter() - self.started
+        return f"{', '.join(parts)}; total {total:.2f}s"
+
+
+def tree_payload(tree) -> list:
+    """Comandos globais no formato enviado ao Discord, em ordem estável"""
+    commands = [cmd.to_dict(tree) for cmd in tree.get_commands()]
+    return sorted(commands, key=lambda c: (c.get("type", AppCommandType.chat_input.value), c["name"]))
+
+
+def tree_hash(tree) -> str:
+    payload = json.dumps(tree_payload(tree), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def sync_tree_if_changed(bot, path: str) -> bool:
+    """
+    Sincroniza a árvore de comandos de barra só quando o hash dela mudou em
+    relação ao último sync bem-sucedido (gravado em `path`, por aplicação).
+    Retorna True se houve sync.
+    """
+    current = tree_hash(bot.tree)
+    app_id = str(bot.application_id)
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+
+    if saved.get(app_id) == current:
+        return False
+
+    await bot.tree.sync()
+    saved[app_id] = current
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(saved, f)
+    except OSError as e:
+        log.warning("⚠️ Hash da árvore de comandos não gravado (o próximo início sincroniza de novo): %s", e)
+    return True
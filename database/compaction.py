@@ -0,0 +1,52 @@
+import logging
+from datetime import datetime, timedelta
+
+log = logging.getLogger(__name__)
+
+# Documento de controle no updates_archive com o lote em andamento e o progresso
+CHECKPOINT_ID = "_compaction_checkpoint"
+
+
+async def compact_updates(updates, older_than_days: float = 30, batch_size: int = 500) -> int:
+    """
+    Move os updates mais antigos que `older_than_days` para o archive diário
+    (UpdatesRepository), em lotes de até `batch_size` documentos, sem carregar
+    o backlog em memória.
+
+    Antes de cada lote os _ids são gravados no checkpoint; depois do $merge e do
+    delete_many o lote é marcado como concluído. Se o processo cair no meio, a
+    próxima execução reaplica o lote pendente (o $merge é idempotente) antes de
+    seguir. Retorna a quantidade de updates arquivados nesta execução.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archived = 0
+
+    checkpoint = await updates.get_checkpoint(CHECKPOINT_ID)
+    pending = (checkpoint or {}).get("pending")
+    if pending:
+        log.info(f"🔁 Retomando lote de compactação interrompido ({len(pending)} update(s)).")
+        await updates.archive_many(pending)
+        await updates.update_checkpoint(CHECKPOINT_ID, {"$unset": {"pending": ""}})
+
+    while True:
+        batch = await updates.archivable(cutoff, batch_size)
+        if not batch:
+            break
+
+        ids = [doc["_id"] for doc in batch]
+        await updates.update_checkpoint(CHECKPOINT_ID, {"$set": {"pending": ids}})
+        await updates.archive_many(ids)
+        await updates.update_checkpoint(
+            CHECKPOINT_ID,
+            {
+                "$unset": {"pending": ""},
+                "$set": {"until": batch[-1]["timestamp"], "updated_at": datetime.utcnow()},
+                "$inc": {"archived": len(ids)},
+            },
+        )
+        archived += len(ids)
+
+        if len(batch) < batch_size:
+            break
+
+    return archived
@@ -1,18 +1,86 @@
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import logging
 
-# -------------------- VARIÁVEIS DE AMBIENTE --------------------
-MONGO_URI = os.getenv("MONGO_URI", "mongodb://localhost:27017") # URI do MongoDB
-MONGO_DB = os.getenv("MONGO_DB") # Nome do banco
-MONGO_STATUS_COLLECTION = os.getenv("MONGO_STATUS_COLLECTION", "status") # Nome da coleção
-MONGO_UPDATES_COLLECTION = os.getenv("MONGO_UPDATES_COLLECTION", "updates") # Coleção de updates
+from core.metrics import MongoCommandListener
+from database.repositories import StateRepository, StatusLogRepository, UpdatesRepository
 
-# -------------------- CONEXÃO --------------------
-client = MongoClient(MONGO_URI)
-db = client[MONGO_DB]
+log = logging.getLogger(__name__)
 
-# Coleções
-status_collection = db[MONGO_STATUS_COLLECTION]
-updates_collection = db[MONGO_UPDATES_COLLECTION]
 
-print(f"[MongoDB] Conectado ao banco '{MONGO_DB}' em {MONGO_URI}")
+class Database:
+    """
+    Camada de dados assíncrona compartilhada pelo bot.
+
+    Um único AsyncIOMotorClient (um único pool de conexões) é criado na
+    primeira utilização, nunca no import. As cogs recebem os repositórios
+    por meio de `bot.db`.
+    """
+
+    def __init__(self):
+        # -------------------- VARIÁVEIS DE AMBIENTE --------------------
+        self.uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")  # URI do MongoDB
+        self.name = os.getenv("MONGO_DB")  # Nome do banco
+        self.pool_options = {
+            "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE") or 50),
+            "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE") or 2),
+            "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_MS") or 60000),
+            "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS") or 5000),
+            "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS") or 5000),
+            "appname": "kookie-chan",
+            "event_listeners": [MongoCommandListener()],  # Latência por coleção em core.metrics
+        }
+        self.collections = {
+            "state": os.getenv("MONGO_STATUS_COLLECTION") or "status",
+            "logs": os.getenv("MONGO_STATUS_LOGS_COLLECTION") or "status_logs",
+            "logs_archive": os.getenv("MONGO_STATUS_ARCHIVE_COLLECTION") or "status_logs_archive",
+            "updates": os.getenv("MONGO_UPDATES_COLLECTION") or "updates",
+            "updates_archive": os.getenv("MONGO_UPDATES_ARCHIVE_COLLECTION") or "updates_archive",
+            "leases": os.getenv("MONGO_LEASES_COLLECTION") or "leases",
+        }
+
+        self._client = None
+        self._repositories = {}
+
+    # -------------------- CONEXÃO --------------------
+    @property
+    def client(self) -> AsyncIOMotorClient:
+        if self._client is None:
+            self._client = AsyncIOMotorClient(self.uri, **self.pool_options)
+            log.info(f"[MongoDB] Cliente criado para o banco '{self.name}' (pool máx. {self.pool_options['maxPoolSize']})")
+        return self._client
+
+    @property
+    def database(self):
+        return self.client[self.name]
+
+    def collection(self, key: str):
+        return self.database[self.collections[key]]
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+            self._repositories.clear()
+
+    # -------------------- REPOSITÓRIOS --------------------
+    def _repository(self, key, factory):
+        if key not in self._repositories:
+            self._repositories[key] = factory()
+        return self._repositories[key]
+
+    @property
+    def state(self) -> StateRepository:
+        return self._repository("state", lambda: StateRepository(self.collection("state")))
+
+    @property
+    def logs(self) -> StatusLogRepository:
+        return self._repository("logs", lambda: StatusLogRepository(
+            self.collection("logs"), self.collection("logs_archive")
+        ))
+
+    @property
+    def updates(self) -> UpdatesRepository:
+        return self._repository("updates", lambda: UpdatesRepository(
+            self.collection("updates"), self.collection("updates_archive")
+        ))
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+log = logging.getLogger(__name__)
+
+
+def default_owner() -> str:
+    """Identificador desta réplica: host (nome do container), pid e um sufixo aleatório"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class LeaderLease:
+    """
+    Eleição de líder por lease no MongoDB: um documento {"_id": nome, "owner",
+    "expires_at", "term"} por lease. Só o dono de um lease válido é líder; ele
+    renova o prazo a cada `ttl / 3` segundos. Se a réplica líder cair, o lease
+    expira e outra réplica o assume na próxima tentativa, em até `ttl` mais um
+    intervalo de renovação.
+
+    Prazos são calculados com $$NOW (relógio do MongoDB), então réplicas com
+    relógios diferentes não disputam o lease. Localmente o líder só se considera
+    líder até `ttl` depois do início da última renovação bem-sucedida; se não
+    conseguir renovar até lá, deixa de ser líder antes que outra réplica assuma.
+
+    `on_change(leader: bool)` é chamado na primeira decisão e a cada troca.
+    Com `enabled=False` a réplica é sempre líder (implantação com uma réplica).
+    """
+
+    def __init__(self, collection, name: str, owner: str = None, ttl: float = 30,
+                 on_change=None, enabled: bool = True):
+        self.collection = collection
+        self.name = name
+        self.owner = owner or default_owner()
+        self.ttl = ttl
+        self.interval = ttl / 3
+        self.on_change = on_change
+        self.enabled = enabled
+
+        self.is_leader = False
+        self.term = None  # Incrementado a cada troca de dono
+        self._decided = False
+        self._valid_until = 0.0  # time.monotonic() até quando o lease é certamente nosso
+        self._task = None
+
+    # -------------------- MongoDB --------------------
+    def _acquire_pipeline(self) -> list:
+        taken = {"$ne": [{"$ifNull": ["$owner", None]}, self.owner]}
+        return [{"$set": {
+            "owner": self.owner,
+            "expires_at": {"$add": ["$$NOW", int(self.ttl * 1000)]},
+            "renewed_at": "$$NOW",
+            "term": {"$cond": [taken, {"$add": [{"$ifNull": ["$term", 0]}, 1]}, "$term"]},
+            "acquired_at": {"$cond": [taken, "$$NOW", "$acquired_at"]},
+        }}]
+
+    async def try_acquire(self) -> bool:
+        """Renova o lease se já é nosso ou o assume se expirou; False se outra réplica o detém"""
+        started = time.monotonic()
+        try:
+            doc = await self.collection.find_one_and_update(
+                {
+                    "_id": self.name,
+                    "$or": [
+                        {"owner": self.owner},
+                        {"$expr": {"$lt": ["$expires_at", "$$NOW"]}},
+                    ],
+                },
+                self._acquire_pipeline(),
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )
+        except DuplicateKeyError:
+            # O documento existe, é de outra réplica e ainda vale: o upsert colidiu no _id
+            return False
+        self.term = doc.get("term")
+        self._valid_until = started + self.ttl
+        return True
+
+    async def release(self):
+        """Libera o lease (encerramento ordenado) para outra réplica assumir na hora"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.enabled and self.is_leader:
+            try:
+                await self.collection.delete_one({"_id": self.name, "owner": self.owner})
+                log.info(f"👋 Lease '{self.name}' liberado.")
+            except Exception as e:
+                log.warning(f"⚠️ Não foi possível liberar o lease '{self.name}' (expira sozinho): %s", e)
+        self.is_leader = False
+
+    # -------------------- Ciclo de vida --------------------
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"lease-{self.name}")
+
+    def _set_leader(self, leader: bool):
+        if self._decided and leader == self.is_leader:
+            return
+        self._decided = True
+        self.is_leader = leader
+        if leader:
+            log.info(f"👑 Esta réplica ({self.owner}) é a líder do lease '{self.name}' (termo {self.term}).")
+        else:
+            log.info(f"🪑 Esta réplica ({self.owner}) não é líder do lease '{self.name}'.")
+        if self.on_change is not None:
+            self.on_change(leader)
+
+    async def _run(self):
+        if not self.enabled:
+            self._set_leader(True)
+            return
+        while True:
+            try:
+                leader = await self.try_acquire()
+            except Exception as e:
+                # Sem MongoDB não dá para renovar: continua líder só enquanto o prazo local valer
+                leader = self.is_leader and time.monotonic() < self._valid_until - self.interval
+                log.warning(f"⚠️ Falha ao renovar o lease '{self.name}': %s", e)
+            self._set_leader(leader)
+            await asyncio.sleep(self.interval)
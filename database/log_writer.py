@@ -0,0 +1,139 @@
+import asyncio
+import logging
+from pymongo.errors import BulkWriteError, CollectionInvalid, OperationFailure
+
+log = logging.getLogger(__name__)
+
+
+async def collection_info(db, name: str) -> list:
+    """Descrição da coleção (tipo e opções) em list_collections; lista vazia se não existe"""
+    cursor = await db.list_collections(filter={"name": name})
+    return await cursor.to_list(length=1)
+
+
+async def ensure_status_logs_collection(db, name: str, ttl_days: float):
+    """
+    Cria a coleção de logs de status como time-series (MongoDB 5.0+), com
+    expiração automática das amostras. Em servidores sem suporte a time-series,
+    ou se a coleção já existe como coleção comum (criada antes, ou pelo primeiro
+    insert_many), usa índice TTL e índice (target, timestamp). Em ambos os casos
+    o TTL é alinhado com `ttl_days`.
+    """
+    ttl = int(ttl_days * 86400)
+    existing = await collection_info(db, name)
+
+    if not existing:
+        try:
+            await db.create_collection(
+                name,
+                timeseries={"timeField": "timestamp", "metaField": "target", "granularity": "minutes"},
+                expireAfterSeconds=ttl,
+            )
+            log.info(f"🗃️ Coleção time-series '{name}' criada (TTL {ttl_days} dias).")
+            return
+        except CollectionInvalid:
+            # Criada por outra instância entre a verificação e o create_collection
+            existing = await collection_info(db, name)
+        except OperationFailure as e:
+            log.warning(f"⚠️ Time-series indisponível ({e}). Usando coleção comum com TTL para '{name}'.")
+
+    if existing and existing[0].get("type") == "timeseries":
+        # Mantém o TTL da coleção time-series alinhado com a configuração atual
+        try:
+            await db.command("collMod", name, expireAfterSeconds=ttl)
+        except OperationFailure as e:
+            log.warning(f"⚠️ TTL de '{name}' não atualizado: {e}")
+        return
+
+    await ensure_ttl_indexes(db[name], ttl)
+
+
+async def ensure_ttl_indexes(coll, ttl: int):
+    """Índice TTL em timestamp e (target, timestamp) de uma coleção comum de logs"""
+    try:
+        await coll.create_index("timestamp", expireAfterSeconds=ttl)
+    except OperationFailure:
+        # O índice TTL já existe com outro prazo: só o prazo é atualizado
+        try:
+            await coll.database.command(
+                "collMod", coll.name, index={"keyPattern": {"timestamp": 1}, "expireAfterSeconds": ttl}
+            )
+        except OperationFailure as e:
+            log.warning(f"⚠️ TTL de '{coll.name}' não atualizado: {e}")
+    await coll.create_index([("target", 1), ("timestamp", -1)])
+
+
+def build_sample(target_name: str, st: dict) -> dict:
+    """Documento compacto de uma verificação"""
+    return {
+        "timestamp": st["timestamp"],
+        "target": target_name,
+        "online": st["online"],
+        "http_code": st["http_code"],
+        "response_time": st["response_time"],
+    }
+
+
+class BufferedLogWriter:
+    """
+    Acumula amostras em memória e as grava em lote com insert_many, a cada
+    `flush_interval` segundos ou assim que o buffer atinge `batch_size`.
+    Em caso de falha as amostras voltam para o buffer, limitado a `max_buffer`
+    (as mais antigas são descartadas primeiro).
+    """
+
+    def __init__(self, repository, flush_interval: float = 30, batch_size: int = 500, max_buffer: int = 50000):
+        self.repository = repository  # StatusLogRepository
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+
+        self._buffer = []
+        self._lock = asyncio.Lock()
+        self._task = None
+        self._pending_flush = None
+
+    def add(self, sample: dict):
+        self._buffer.append(sample)
+        if len(self._buffer) > self.max_buffer:
+            del self._buffer[: len(self._buffer) - self.max_buffer]
+        if len(self._buffer) >= self.batch_size and (self._pending_flush is None or self._pending_flush.done()):
+            self._pending_flush = asyncio.create_task(self.flush())
+
+    async def flush(self) -> int:
+        async with self._lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer = self._buffer, []
+            try:
+                await self.repository.insert_many(batch)
+            except BulkWriteError as e:
+                # Parte do lote foi gravada; reenviar duplicaria amostras
+                log.warning("⚠️ Lote de amostras de status gravado parcialmente: %s", e.details.get("writeErrors", [])[:1])
+                return e.details.get("nInserted", 0)
+            except Exception as e:
+                log.warning(f"⚠️ Falha ao gravar {len(batch)} amostra(s) de status: %s", e)
+                self._buffer[:0] = batch
+                if len(self._buffer) > self.max_buffer:
+                    del self._buffer[: len(self._buffer) - self.max_buffer]
+                return 0
+            return len(batch)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="status-log-writer")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
@@ -0,0 +1,208 @@
+from datetime import datetime
+from pymongo import ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from utils import content_hash
+
+
+class StateRepository:
+    """Documentos de estado dos alvos monitorados: {"_id": alvo, "state": {...}}"""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    async def find_many(self, ids: list) -> dict:
+        """Estados salvos dos alvos informados, em uma única consulta: {_id: state}"""
+        found = {}
+        async for doc in self.collection.find({"_id": {"$in": list(ids)}}):
+            found[doc["_id"]] = doc.get("state") or {}
+        return found
+
+    async def set_fields(self, changes: dict):
+        """Grava apenas os campos alterados: {_id: {campo: valor}} em um único bulk_write"""
+        ops = [
+            UpdateOne({"_id": doc_id}, {"$set": {f"state.{k}": v for k, v in fields.items()}}, upsert=True)
+            for doc_id, fields in changes.items()
+            if fields
+        ]
+        if ops:
+            await self.collection.bulk_write(ops, ordered=False)
+
+
+class ArchivedRepository:
+    """
+    Base das coleções com documentos recentes (`collection`, ordenados por
+    timestamp) e um archive compactado, que guarda também o documento de
+    checkpoint da compactação.
+    """
+
+    def __init__(self, collection, archive):
+        self.collection = collection
+        self.archive = archive
+
+    async def page(self, key=None, older: bool = True, limit: int = 2) -> list:
+        """
+        Paginação por keyset (timestamp, _id): os `limit` documentos vizinhos de
+        `key` (mais antigos ou mais recentes); sem `key`, os mais recentes.
+        """
+        if key is None:
+            query = {}
+        else:
+            ts, _id = key
+            op = "$lt" if older else "$gt"
+            query = {"$or": [{"timestamp": {op: ts}}, {"timestamp": ts, "_id": {op: _id}}]}
+        order = -1 if older else 1
+        cursor = self.collection.find(query).sort([("timestamp", order), ("_id", order)]).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    # -------------------- Checkpoint da compactação --------------------
+    async def get_checkpoint(self, checkpoint_id: str):
+        return await self.archive.find_one({"_id": checkpoint_id})
+
+    async def update_checkpoint(self, checkpoint_id: str, update: dict):
+        await self.archive.update_one({"_id": checkpoint_id}, update, upsert=True)
+
+
+class StatusLogRepository(ArchivedRepository):
+    """Amostras brutas das verificações (status_logs) e buckets compactados (archive)"""
+
+    async def insert_many(self, samples: list):
+        await self.collection.insert_many(samples, ordered=False)
+
+    # -------------------- Amostras brutas --------------------
+    async def first_sample(self, since: datetime, before: datetime):
+        """Amostra mais antiga em [since, before), ou None"""
+        return await self.collection.find_one(
+            {"timestamp": {"$gte": since, "$lt": before}},
+            {"timestamp": 1},
+            sort=[("timestamp", 1)],
+        )
+
+    def samples(self, start: datetime, end: datetime):
+        """Cursor (em ordem cronológica) das amostras de [start, end), só com os campos agregados"""
+        return self.collection.find(
+            {"timestamp": {"$gte": start, "$lt": end}},
+            {"_id": 0, "timestamp": 1, "target": 1, "online": 1, "http_code": 1, "response_time": 1},
+        ).sort("timestamp", 1).batch_size(2000)
+
+    async def delete_samples(self, start: datetime, end: datetime):
+        await self.collection.delete_many({"timestamp": {"$gte": start, "$lt": end}})
+
+    def aggregate(self, pipeline: list):
+        """Agregação sobre as amostras brutas (cursor assíncrono)"""
+        return self.collection.aggregate(pipeline, allowDiskUse=True)
+
+    # -------------------- Buckets compactados --------------------
+    def buckets(self, target: str, granularity: str, starts: list):
+        """Cursor dos buckets do alvo com exatamente os inícios informados"""
+        return self.archive.find({
+            "target": target,
+            "granularity": granularity,
+            "start": {"$in": list(starts)},
+        })
+
+    async def save_buckets(self, docs: list):
+        """Grava (substituindo) buckets identificados por (target, granularity, start)"""
+        ops = [
+            ReplaceOne(
+                {"target": doc["target"], "granularity": doc["granularity"], "start": doc["start"]},
+                doc,
+                upsert=True,
+            )
+            for doc in docs
+        ]
+        if ops:
+            await self.archive.bulk_write(ops, ordered=False)
+
+
+def archive_merge_pipeline(ids: list, archive_name: str) -> list:
+    """
+    Agrupa os updates informados por dia e funde no archive. Os updates que o
+    documento do dia já tem (mesmo _id) não são repetidos, então reaplicar um
+    lote interrompido não duplica nada.
+    """
+    return [
+        {"$match": {"_id": {"$in": ids}}},
+        {"$sort": {"timestamp": 1, "_id": 1}},
+        {"$group": {
+            "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}},
+            "updates": {"$push": "$$ROOT"},
+        }},
+        {"$project": {"_id": 0, "date": "$_id", "updates": 1}},
+        {"$merge": {
+            "into": archive_name,
+            "on": "date",  # índice único date_unique (database/schema.py)
+            "whenMatched": [
+                {"$set": {"updates": {"$concatArrays": [
+                    "$updates",
+                    {"$filter": {
+                        "input": "$$new.updates",
+                        "cond": {"$not": [{"$in": ["$$this._id", "$updates._id"]}]},
+                    }},
+                ]}}},
+            ],
+            "whenNotMatched": "insert",
+        }},
+    ]
+
+
+class UpdatesRepository(ArchivedRepository):
+    """Anúncios raspados (updates) e seu arquivo diário (updates_archive)"""
+
+    async def insert_new(self, updates: list) -> list:
+        """
+        Grava os updates em um único bulk_write de upserts pelo hash do conteúdo
+        e retorna apenas os que foram inseridos agora. O índice único em
+        content_hash garante que chamadas concorrentes não dupliquem anúncios.
+        """
+        unique = {}
+        for u in updates:
+            unique.setdefault(content_hash(u["title"], u["description"]), u)
+        if not unique:
+            return []
+
+        items = list(unique.items())
+        now_dt = datetime.utcnow()
+        ops = [
+            UpdateOne(
+                {"content_hash": h},
+                {"$setOnInsert": {
+                    "content_hash": h,
+                    "title": u["title"],
+                    "description": u["description"],
+                    "date": u["date"],
+                    "timestamp": now_dt
+                }},
+                upsert=True
+            )
+            for h, u in items
+        ]
+
+        try:
+            result = await self.collection.bulk_write(ops, ordered=False)
+            inserted = result.upserted_ids.keys()
+        except BulkWriteError as e:
+            # Outra chamada inseriu o mesmo hash ao mesmo tempo: vale o que foi gravado aqui
+            inserted = [u["index"] for u in e.details.get("upserted", [])]
+
+        return [items[i][1] for i in sorted(inserted)]
+
+    async def latest(self, limit: int) -> list:
+        cursor = self.collection.find().sort("timestamp", -1).limit(limit)
+        return await cursor.to_list(length=limit)
+
+    # -------------------- Arquivo --------------------
+    async def archivable(self, before: datetime, limit: int) -> list:
+        """Até `limit` updates mais antigos que `before` ({_id, timestamp}), do mais antigo ao mais novo"""
+        cursor = self.collection.find(
+            {"timestamp": {"$lt": before}},
+            {"_id": 1, "timestamp": 1},
+            sort=[("timestamp", 1), ("_id", 1)],
+            limit=limit,
+        )
+        return await cursor.to_list(length=limit)
+
+    async def archive_many(self, ids: list):
+        """Funde os updates no archive diário ($merge idempotente) e os remove da coleção"""
+        await self.collection.aggregate(archive_merge_pipeline(ids, self.archive.name)).to_list(length=None)
+        await self.collection.delete_many({"_id": {"$in": ids}})
@@ -0,0 +1,185 @@
+import logging
+from datetime import datetime, timedelta
+from pymongo.errors import OperationFailure
+
+from core.histogram import LatencyHistogram
+
+log = logging.getLogger(__name__)
+
+# Documento de controle no archive com o fim do último dia compactado
+CHECKPOINT_ID = "_rollup_checkpoint"
+
+
+def floor_hour(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(dt: datetime) -> datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def code_key(code) -> str:
+    return str(code) if code is not None else "erro"
+
+
+class BucketStats:
+    """
+    Estatísticas agregadas de um intervalo (hora, dia ou janela arbitrária).
+
+    up_seconds/down_seconds somam o tempo coberto por cada amostra (até a
+    próxima, limitado a max_gap), incidents conta transições online -> offline.
+    Todos os campos são somáveis, então buckets podem ser mesclados livremente.
+    """
+
+    __slots__ = ("count", "up", "down", "up_seconds", "down_seconds", "incidents", "hist", "codes")
+
+    def __init__(self):
+        self.count = 0
+        self.up = 0
+        self.down = 0
+        self.up_seconds = 0.0
+        self.down_seconds = 0.0
+        self.incidents = 0
+        self.hist = LatencyHistogram()
+        self.codes = {}
+
+    def add_sample(self, online: bool, http_code, response_time):
+        self.count += 1
+        if online:
+            self.up += 1
+        else:
+            self.down += 1
+        self.hist.add(response_time)
+        key = code_key(http_code)
+        self.codes[key] = self.codes.get(key, 0) + 1
+
+    def credit(self, online: bool, seconds: float):
+        if seconds <= 0:
+            return
+        if online:
+            self.up_seconds += seconds
+        else:
+            self.down_seconds += seconds
+
+    def merge(self, other: "BucketStats"):
+        self.count += other.count
+        self.up += other.up
+        self.down += other.down
+        self.up_seconds += other.up_seconds
+        self.down_seconds += other.down_seconds
+        self.incidents += other.incidents
+        self.hist.merge(other.hist)
+        for key, n in other.codes.items():
+            self.codes[key] = self.codes.get(key, 0) + n
+        return self
+
+    def to_doc(self, target: str, granularity: str, start: datetime) -> dict:
+        latency = {"min": self.hist.min, "avg": self.hist.avg, "max": self.hist.max}
+        latency.update(self.hist.percentiles())
+        return {
+            "target": target,
+            "granularity": granularity,
+            "start": start,
+            "count": self.count,
+            "up": self.up,
+            "down": self.down,
+            "up_seconds": self.up_seconds,
+            "down_seconds": self.down_seconds,
+            "incidents": self.incidents,
+            "latency": latency,
+            "hist": self.hist.to_doc(),
+            "codes": self.codes,
+        }
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "BucketStats":
+        stats = cls()
+        stats.count = doc.get("count", 0)
+        stats.up = doc.get("up", 0)
+        stats.down = doc.get("down", 0)
+        stats.up_seconds = doc.get("up_seconds", 0.0)
+        stats.down_seconds = doc.get("down_seconds", 0.0)
+        stats.incidents = doc.get("incidents", 0)
+        stats.hist = LatencyHistogram.from_doc(doc.get("hist"))
+        stats.codes = dict(doc.get("codes") or {})
+        return stats
+
+
+async def _rollup_day(logs, day: datetime, max_gap: float, target_gaps: dict, prev_online: dict) -> dict:
+    """Lê as amostras de um dia em streaming e devolve os buckets horários {(target, hora): BucketStats}"""
+    day_end = day + timedelta(days=1)
+    hourly = {}
+    last = {}  # target -> (timestamp, online, bucket) da amostra anterior
+
+    async for sample in logs.samples(day, day_end):
+        target = sample.get("target")
+        ts = sample["timestamp"]
+        online = bool(sample.get("online"))
+        bucket = hourly.get((target, floor_hour(ts)))
+        if bucket is None:
+            bucket = hourly[(target, floor_hour(ts))] = BucketStats()
+
+        prev = last.get(target)
+        if prev:
+            prev[2].credit(prev[1], min((ts - prev[0]).total_seconds(), target_gaps.get(target, max_gap)))
+        if prev_online.get(target) and not online:
+            bucket.incidents += 1
+
+        bucket.add_sample(online, sample.get("http_code"), sample.get("response_time"))
+        last[target] = (ts, online, bucket)
+        prev_online[target] = online
+
+    # A última amostra de cada alvo cobre até o fim do dia (limitado a max_gap)
+    for target, (ts, online, bucket) in last.items():
+        bucket.credit(online, min((day_end - ts).total_seconds(), target_gaps.get(target, max_gap)))
+
+    return hourly
+
+
+async def rollup_status_logs(logs, older_than_days: float, max_gap: float, target_gaps: dict = None) -> int:
+    """
+    Compacta as amostras brutas mais antigas que `older_than_days` em buckets
+    horários e diários no archive (StatusLogRepository) e remove as amostras
+    compactadas. Cada amostra cobre até a seguinte, limitado ao teto do alvo em
+    `target_gaps` (ou `max_gap` para alvos sem teto próprio).
+
+    Processa um dia (UTC) por vez, do mais antigo ao mais recente, e registra um
+    checkpoint ao final de cada dia; como os buckets são gravados com ReplaceOne,
+    reprocessar um dia interrompido produz o mesmo resultado. Retorna a
+    quantidade de dias compactados.
+    """
+    cutoff = floor_day(datetime.utcnow() - timedelta(days=older_than_days))
+    checkpoint = await logs.get_checkpoint(CHECKPOINT_ID)
+    since = checkpoint["until"] if checkpoint else datetime.min
+
+    prev_online = {}
+    days = 0
+    while True:
+        first = await logs.first_sample(since, cutoff)
+        if not first:
+            break
+
+        day = floor_day(first["timestamp"])
+        day_end = day + timedelta(days=1)
+        hourly = await _rollup_day(logs, day, max_gap, target_gaps or {}, prev_online)
+
+        daily = {}
+        docs = []
+        for (target, hour), stats in hourly.items():
+            docs.append(stats.to_doc(target, "hour", hour))
+            daily.setdefault(target, BucketStats()).merge(stats)
+        for target, stats in daily.items():
+            docs.append(stats.to_doc(target, "day", day))
+        await logs.save_buckets(docs)
+
+        try:
+            await logs.delete_samples(day, day_end)
+        except OperationFailure as e:
+            # Versões antigas de time-series só apagam por metaField; o TTL remove depois
+            log.warning(f"⚠️ Amostras de {day:%d/%m/%Y} compactadas, mas não removidas: %s", e)
+
+        await logs.update_checkpoint(CHECKPOINT_ID, {"$set": {"until": day_end}})
+        since = day_end
+        days += 1
+
+    return days
@@ -0,0 +1,127 @@
+import logging
+import os
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError, OperationFailure
+
+from database.log_writer import ensure_status_logs_collection
+from utils import content_hash
+
+log = logging.getLogger(__name__)
+
+
+def index_specs(names: dict) -> dict:
+    """Índices esperados por coleção"""
+    return {
+        names["updates"]: [
+            # Deduplicação dos anúncios raspados pelo hash do conteúdo normalizado
+            IndexModel(
+                [("content_hash", ASCENDING)],
+                name="content_hash_unique",
+                unique=True,
+                partialFilterExpression={"content_hash": {"$exists": True}},
+            ),
+            # /updates, /historico updates e a compactação ordenam/filtram por timestamp
+            IndexModel([("timestamp", DESCENDING), ("_id", DESCENDING)], name="timestamp_id"),
+        ],
+        names["updates_archive"]: [
+            IndexModel([("date", ASCENDING)], name="date_unique", unique=True),
+        ],
+        names["logs"]: [
+            IndexModel([("target", ASCENDING), ("timestamp", DESCENDING)], name="target_timestamp"),
+            IndexModel([("timestamp", DESCENDING)], name="timestamp"),
+        ],
+        names["logs_archive"]: [
+            IndexModel(
+                [("target", ASCENDING), ("granularity", ASCENDING), ("start", ASCENDING)],
+                name="target_granularity_start",
+                unique=True,
+            ),
+        ],
+        names["leases"]: [
+            # Leases abandonados (réplica que sumiu sem liberar) são removidos pelo MongoDB
+            IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+        ],
+    }
+
+
+# Índices substituídos por versões novas: {coleção: [nomes]}
+def obsolete_indexes(names: dict) -> dict:
+    return {
+        names["updates"]: ["title_unique"],  # Substituído por content_hash_unique
+    }
+
+
+async def backfill_update_hashes(collection, batch_size: int = 500) -> int:
+    """
+    Preenche content_hash nos updates gravados antes da deduplicação por hash.
+    Duplicatas de conteúdo já existentes ficam sem hash (o índice único é parcial).
+    """
+    filled = 0
+    ops = []
+    cursor = collection.find({"content_hash": {"$exists": False}}, {"title": 1, "description": 1})
+    async for doc in cursor:
+        h = content_hash(doc.get("title"), doc.get("description"))
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": {"content_hash": h}}))
+        if len(ops) >= batch_size:
+            filled += await _apply(collection, ops)
+            ops = []
+    if ops:
+        filled += await _apply(collection, ops)
+    return filled
+
+
+async def _apply(collection, ops) -> int:
+    try:
+        return (await collection.bulk_write(ops, ordered=False)).modified_count
+    except BulkWriteError as e:
+        return e.details.get("nModified", 0)
+
+
+async def bootstrap(database):
+    """
+    Prepara coleções e índices da camada de dados (database.Database).
+    Idempotente: pode rodar a cada inicialização. Conflitos (por exemplo,
+    duplicatas impedindo um índice único) são reportados sem interromper o bot.
+    """
+    names = database.collections
+    db = database.database
+    ttl_days = float(os.getenv("STATUS_LOGS_TTL_DAYS") or 30)
+
+    await ensure_status_logs_collection(db, names["logs"], ttl_days)
+
+    for coll_name, index_names in obsolete_indexes(names).items():
+        existing = await db[coll_name].index_information()
+        for name in index_names:
+            if name in existing:
+                await db[coll_name].drop_index(name)
+                log.info(f"🧹 Índice obsoleto '{name}' removido de '{coll_name}'.")
+
+    for coll_name, models in index_specs(names).items():
+        for model in models:
+            try:
+                await db[coll_name].create_indexes([model])
+            except OperationFailure as e:
+                log.warning(f"⚠️ Índice '{model.document['name']}' em '{coll_name}' não criado: {e}")
+
+    filled = await backfill_update_hashes(db[names["updates"]])
+    if filled:
+        log.info(f"🔑 content_hash preenchido em {filled} update(s) antigo(s).")
+
+
+async def index_usage(database) -> dict:
+    """Uso de cada índice desde o último restart do MongoDB: {coleção: {índice: operações}}"""
+    db = database.database
+    usage = {}
+    for coll_name in database.collections.values():
+        try:
+            stats = await db[coll_name].aggregate([{"$indexStats": {}}]).to_list(length=None)
+        except OperationFailure:
+            continue
+        usage[coll_name] = {s["name"]: s["accesses"]["ops"] for s in stats}
+    return usage
+
+
+def log_index_usage(usage: dict):
+    for coll_name, indexes in usage.items():
+        line = ", ".join(f"{name}={ops}" for name, ops in sorted(indexes.items()))
+        log.info(f"   📇 {coll_name}: {line or 'sem índices'}")
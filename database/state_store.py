@@ -0,0 +1,115 @@
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+
+class WriteBehindStore:
+    """
+    Camada de escrita tardia (write-behind) para documentos de estado no formato
+    {"_id": ..., "state": {...}}.
+
+    Os dicionários de estado ficam em memória e são alterados livremente; quem os
+    altera apenas marca o documento como sujo. Periodicamente (ou sob demanda, em
+    transições importantes) somente os campos que mudaram desde a última escrita
+    são enviados, em um único bulk_write. No encerramento, close() grava o que faltar.
+    """
+
+    def __init__(self, repository, flush_interval: float = 30):
+        self.repository = repository  # StateRepository
+        self.flush_interval = flush_interval
+
+        self.states = {}  # _id -> dicionário de estado vivo
+        self._persisted = {}  # _id -> cópia do que já está no MongoDB
+        self._dirty = set()
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    # -------------------- Carga --------------------
+    async def load_many(self, states: dict):
+        """
+        Registra os estados (_id -> dict com valores padrão) e os completa com o
+        que estiver salvo, em uma única consulta. Documentos inexistentes ficam
+        sujos para serem criados no próximo flush.
+        """
+        self.states.update(states)
+        found = await self.repository.find_many(list(states))
+        for doc_id, saved in found.items():
+            states[doc_id].update(saved)
+            self._persisted[doc_id] = dict(saved)
+
+        for doc_id in states:
+            if doc_id not in found:
+                self._persisted[doc_id] = {}
+                self._dirty.add(doc_id)
+        return set(found)
+
+    # -------------------- Marcação --------------------
+    def mark_dirty(self, doc_id):
+        self._dirty.add(doc_id)
+
+    def _diff(self, doc_id) -> dict:
+        state = self.states[doc_id]
+        persisted = self._persisted.get(doc_id, {})
+        return {
+            key: value
+            for key, value in state.items()
+            if key not in persisted or persisted[key] != value
+        }
+
+    # -------------------- Escrita --------------------
+    async def flush(self, *doc_ids):
+        """Grava os campos alterados dos documentos informados (ou de todos os sujos)"""
+        async with self._lock:
+            pending = [d for d in (doc_ids or list(self._dirty)) if d in self._dirty]
+            diffs, snapshots = {}, {}
+            for doc_id in pending:
+                diff = self._diff(doc_id)
+                if diff:
+                    diffs[doc_id] = diff
+                    snapshots[doc_id] = dict(self.states[doc_id])
+                else:
+                    self._dirty.discard(doc_id)
+
+            if not diffs:
+                return 0
+
+            try:
+                await self.repository.set_fields(diffs)
+            except Exception as e:
+                # Mantém os documentos sujos para a próxima tentativa
+                log.warning("⚠️ Falha ao persistir estado no MongoDB: %s", e)
+                return 0
+
+            for doc_id, snapshot in snapshots.items():
+                self._persisted[doc_id] = snapshot
+                # Só limpa se nada mudou enquanto o bulk_write estava em andamento
+                if self._diff(doc_id) == {}:
+                    self._dirty.discard(doc_id)
+            return len(diffs)
+
+    # -------------------- Ciclo de vida --------------------
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="state-write-behind")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def close(self, flush: bool = True):
+        """Para a gravação periódica; com flush=False descarta o que estava pendente"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if not flush:
+            self._dirty.clear()
+            return
+        written = await self.flush()
+        if written:
+            log.info(f"💾 {written} estado(s) gravado(s) no MongoDB antes do encerramento.")
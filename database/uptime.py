@@ -0,0 +1,220 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from core.histogram import LOG_GAMMA
+from database.rollup import BucketStats, code_key, floor_day, floor_hour
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+
+def contiguous_runs(starts: list, step: timedelta) -> list:
+    """Agrupa inícios ordenados em trechos contíguos: [(início, fim exclusivo), ...]"""
+    runs = []
+    for start in sorted(starts):
+        if runs and runs[-1][1] == start:
+            runs[-1][1] = start + step
+        else:
+            runs.append([start, start + step])
+    return [tuple(run) for run in runs]
+
+
+class WindowReport:
+    """Resultado de uma consulta de uptime para um alvo e uma janela [start, end)"""
+
+    def __init__(self, target: str, start: datetime, end: datetime, stats: BucketStats):
+        self.target = target
+        self.start = start
+        self.end = end
+        self.stats = stats
+
+    @property
+    def uptime(self):
+        covered = self.stats.up_seconds + self.stats.down_seconds
+        return 100 * self.stats.up_seconds / covered if covered else None
+
+    @property
+    def mttr(self):
+        """Tempo médio de recuperação (s): tempo offline / quedas"""
+        return self.stats.down_seconds / self.stats.incidents if self.stats.incidents else None
+
+    @property
+    def mtbf(self):
+        """Tempo médio entre falhas (s): tempo online / quedas"""
+        return self.stats.up_seconds / self.stats.incidents if self.stats.incidents else None
+
+    def percentiles(self) -> dict:
+        return self.stats.hist.percentiles()
+
+
+class UptimeEngine:
+    """
+    Calcula uptime, MTTR, MTBF e percentis de latência para janelas arbitrárias.
+
+    A janela é decomposta em dias completos e horas (UTC). Unidades já encerradas
+    vêm dos buckets do archive ou, se ainda não compactadas, de um pipeline de
+    agregação sobre os logs brutos, e ficam em um cache LRU porque não mudam mais.
+    Só o trecho em aberto (a hora atual) é recalculado a cada consulta.
+    """
+
+    def __init__(self, logs, max_gap: float, settle: float = 120, cache_size: int = 5000, target_gaps: dict = None):
+        self.logs = logs  # StatusLogRepository
+        self.max_gap = max_gap
+        self.target_gaps = target_gaps or {}  # alvo -> tempo máximo coberto por uma amostra (s)
+        self.settle = timedelta(seconds=settle)  # Tempo para o buffer de logs chegar ao MongoDB
+        self.cache_size = cache_size
+        self._cache = OrderedDict()  # (target, granularidade, início) -> BucketStats
+
+    # -------------------- Cache --------------------
+    def cached_units(self) -> int:
+        return len(self._cache)
+
+    def _cache_get(self, key):
+        stats = self._cache.get(key)
+        if stats is not None:
+            self._cache.move_to_end(key)
+        return stats
+
+    def _cache_put(self, key, stats):
+        self._cache[key] = stats
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # -------------------- Fontes --------------------
+    async def _from_archive(self, target: str, granularity: str, starts: list) -> dict:
+        found = {}
+        async for doc in self.logs.buckets(target, granularity, starts):
+            found[doc["start"]] = BucketStats.from_doc(doc)
+        return found
+
+    async def _from_raw(self, target: str, start: datetime, end: datetime, unit: str = None) -> dict:
+        """
+        Agrega as amostras brutas de [start, end) no servidor, agrupadas por
+        `unit` ("hour"/"day") ou em um único grupo quando unit é None.
+        """
+        now = datetime.utcnow()
+        bucket = {"$dateTrunc": {"date": "$timestamp", "unit": unit}} if unit else None
+        pipeline = [
+            {"$match": {"target": target, "timestamp": {"$gte": start, "$lt": end}}},
+            {"$setWindowFields": {
+                "sortBy": {"timestamp": 1},
+                "output": {
+                    "next_ts": {"$shift": {"output": "$timestamp", "by": 1}},
+                    "prev_online": {"$shift": {"output": "$online", "by": -1}},
+                },
+            }},
+            {"$set": {
+                "bucket": bucket,
+                "gap": {"$min": [
+                    self.target_gaps.get(target, self.max_gap),
+                    {"$divide": [{"$subtract": [{"$ifNull": ["$next_ts", min(end, now)]}, "$timestamp"]}, 1000]},
+                ]},
+            }},
+            {"$facet": {
+                "summary": [{"$group": {
+                    "_id": "$bucket",
+                    "count": {"$sum": 1},
+                    "up": {"$sum": {"$cond": ["$online", 1, 0]}},
+                    "up_seconds": {"$sum": {"$cond": ["$online", "$gap", 0]}},
+                    "down_seconds": {"$sum": {"$cond": ["$online", 0, "$gap"]}},
+                    "incidents": {"$sum": {"$cond": [
+                        {"$and": [{"$eq": ["$prev_online", True]}, {"$eq": ["$online", False]}]}, 1, 0
+                    ]}},
+                }}],
+                "hist": [
+                    {"$match": {"response_time": {"$gt": 0}}},
+                    {"$group": {
+                        "_id": {
+                            "bucket": "$bucket",
+                            "index": {"$ceil": {"$divide": [{"$ln": "$response_time"}, LOG_GAMMA]}},
+                        },
+                        "n": {"$sum": 1},
+                        "total": {"$sum": "$response_time"},
+                        "min": {"$min": "$response_time"},
+                        "max": {"$max": "$response_time"},
+                    }},
+                ],
+                "codes": [{"$group": {"_id": {"bucket": "$bucket", "code": "$http_code"}, "n": {"$sum": 1}}}],
+            }},
+        ]
+
+        result = {}
+        async for facets in self.logs.aggregate(pipeline):
+            for row in facets["summary"]:
+                stats = result.setdefault(row["_id"], BucketStats())
+                stats.count = row["count"]
+                stats.up = row["up"]
+                stats.down = row["count"] - row["up"]
+                stats.up_seconds = row["up_seconds"]
+                stats.down_seconds = row["down_seconds"]
+                stats.incidents = row["incidents"]
+            for row in facets["hist"]:
+                stats = result.setdefault(row["_id"]["bucket"], BucketStats())
+                stats.hist.add_bucket(int(row["_id"]["index"]), row["n"], row["total"], row["min"], row["max"])
+            for row in facets["codes"]:
+                stats = result.setdefault(row["_id"]["bucket"], BucketStats())
+                stats.codes[code_key(row["_id"]["code"])] = row["n"]
+        return result
+
+    async def _closed_units(self, target: str, granularity: str, starts: list) -> list:
+        """Estatísticas das unidades encerradas, do cache, do archive ou dos logs brutos"""
+        if not starts:
+            return []
+        step = DAY if granularity == "day" else HOUR
+        stats = {}
+        missing = []
+        for start in starts:
+            cached = self._cache_get((target, granularity, start))
+            if cached is not None:
+                stats[start] = cached
+            else:
+                missing.append(start)
+
+        if missing:
+            loaded = await self._from_archive(target, granularity, missing)
+            still_missing = [s for s in missing if s not in loaded]
+            # Uma agregação por trecho contíguo, para não varrer o intervalo entre unidades distantes
+            for run_start, run_end in contiguous_runs(still_missing, step):
+                raw = await self._from_raw(target, run_start, run_end, granularity)
+                loaded.update({s: raw[s] for s in still_missing if s in raw})
+            for start in missing:
+                # Unidades sem amostras também são guardadas para não serem consultadas de novo
+                unit = loaded.get(start) or BucketStats()
+                self._cache_put((target, granularity, start), unit)
+                stats[start] = unit
+
+        return [stats[s] for s in starts]
+
+    # -------------------- Consulta --------------------
+    async def report(self, target: str, start: datetime, end: datetime) -> WindowReport:
+        """Relatório de [start, end) em UTC (naive). O início é alinhado à hora cheia"""
+        now = datetime.utcnow()
+        start = floor_hour(start)
+        end = min(end, now)
+        closed_end = min(end, floor_hour(now - self.settle))
+
+        days, hours = [], []
+        cursor = start
+        while cursor < closed_end:
+            if cursor == floor_day(cursor) and cursor + DAY <= closed_end:
+                days.append(cursor)
+                cursor += DAY
+            elif cursor + HOUR <= closed_end:
+                hours.append(cursor)
+                cursor += HOUR
+            else:
+                break
+
+        total = BucketStats()
+        for stats in await self._closed_units(target, "day", days):
+            total.merge(stats)
+        for stats in await self._closed_units(target, "hour", hours):
+            total.merge(stats)
+
+        # Trecho em aberto: sempre calculado na hora
+        if cursor < end:
+            for stats in (await self._from_raw(target, cursor, end)).values():
+                total.merge(stats)
+
+        return WindowReport(target, start, end, total)
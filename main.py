@@ -1,21 +1,49 @@
 import os
 import asyncio
-from discord.ext import commands
+import logging
+import signal
 from dotenv import load_dotenv
-import discord
+
+from core.http import HttpClient
+from core.logs import setup_logging
+from core.metrics import discord_trace_config
+from core.profiler import LoopProfiler
+from core.runtime import build_bot
+from core.startup import PhaseTimer, sync_tree_if_changed
+from database.database import Database
+from database.lease import LeaderLease
+from database.schema import bootstrap, index_usage, log_index_usage
 
 # -----------------------------
 # Configuração inicial
 # -----------------------------
 load_dotenv()
+# Logs em JSON escritos por uma thread separada; nada bloqueia o event loop
+log_listener = setup_logging()
+log = logging.getLogger("main")
+
+# Profiling do event loop (atraso, callbacks lentos e amostras de pilha), desligado por padrão
+PROFILE = (os.getenv("PROFILE") or "").lower() in ("1", "true", "on")
+PROFILE_SLOW_CALLBACK_MS = float(os.getenv("PROFILE_SLOW_CALLBACK_MS") or 100)  # Limite de callback lento (ms)
+
+# Dados locais persistidos entre reinícios (volume ./data no docker-compose)
+DATA_DIR = os.getenv("DATA_DIR") or "data"
+COMMAND_TREE_HASH_FILE = os.path.join(DATA_DIR, "command_tree.json")  # Hash do último sync de comandos
 
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
+# Eleição de líder entre réplicas: só a líder roda as tarefas em segundo plano (monitor, updates automáticos)
+LEADER_ELECTION = (os.getenv("LEADER_ELECTION") or "on").lower() not in ("0", "false", "off")
+LEADER_LEASE_TTL = float(os.getenv("LEADER_LEASE_TTL") or 30)  # Validade do lease; a troca de líder acontece nesse prazo (s)
+LEADER_ID = os.getenv("LEADER_ID")  # Identificador da réplica (padrão: host:pid:sufixo aleatório)
 
-bot = commands.Bot(command_prefix="none", intents=intents)
+# Bootstrap do MongoDB repetido até o banco responder
+DB_BOOTSTRAP_RETRY = float(os.getenv("DB_BOOTSTRAP_RETRY") or 5)  # Primeira espera (s), dobrada a cada falha
+DB_BOOTSTRAP_RETRY_MAX = 60  # Espera máxima (s)
 
-slash_synced = False
+# Intents, caches e shards vêm do perfil de execução (BOT_* no .env)
+# http_trace mede as chamadas REST ao Discord (inclusive 429) para o endpoint de métricas
+bot = build_bot(command_prefix="none", http_trace=discord_trace_config())
+
+startup = PhaseTimer()
 
 # -----------------------------
 # Carregamento de cogs
@@ -23,12 +51,12 @@ slash_synced = False
 async def load_cog(cog_name: str):
     try:
         await bot.load_extension(cog_name)
-        print(f"[+] Cog '{cog_name}' carregada")
+        log.info(f"[+] Cog '{cog_name}' carregada")
     except Exception as e:
-        print(f"[!] Erro ao carregar '{cog_name}': {e}")
+        log.error(f"[!] Erro ao carregar '{cog_name}': {e}")
 
 async def load_cogs():
-    print("⏳ Carregando cogs...")
+    log.info("⏳ Carregando cogs...")
     tasks_list = []
     for file in os.listdir("./cogs"):
         if file.endswith(".py"):
@@ -36,38 +64,128 @@ async def load_cogs():
             tasks_list.append(load_cog(cog_name))
     if tasks_list:
         await asyncio.gather(*tasks_list)
-    print("✅ Todas as cogs carregadas!")
+    log.info("✅ Todas as cogs carregadas!")
 
 async def init_database():
-    print("⏳ Inicializando banco de dados...")
-    # Coloque aqui seu código real de inicialização
-    await asyncio.sleep(1)
-    print("✅ Banco de dados inicializado!")
+    """
+    Bootstrap de coleções e índices, repetido com backoff até o MongoDB responder
+    (no docker-compose o bot pode subir antes dele). A eleição de líder espera
+    por aqui, então nenhuma tarefa grava antes dos índices existirem.
+    """
+    log.info("⏳ Inicializando banco de dados...")
+    delay = DB_BOOTSTRAP_RETRY
+    with startup.phase("db"):
+        while True:
+            try:
+                await bootstrap(bot.db)
+                break
+            except Exception as e:
+                log.error(f"[!] Erro ao inicializar banco de dados (nova tentativa em {delay:.0f}s): {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, DB_BOOTSTRAP_RETRY_MAX)
+    log.info("✅ Banco de dados inicializado!")
+    try:
+        log.info("📇 Uso dos índices desde o último restart do MongoDB:")
+        log_index_usage(await index_usage(bot.db))
+    except Exception as e:
+        log.warning(f"⚠️ Não foi possível ler o uso dos índices: {e}")
+
+# -----------------------------
+# Comandos de slash
+# -----------------------------
+async def sync_commands():
+    try:
+        with startup.phase("sync"):
+            synced = await sync_tree_if_changed(bot, COMMAND_TREE_HASH_FILE)
+        if synced:
+            log.info("✅ Comandos de slash sincronizados!")
+        else:
+            log.info("⏭️ Árvore de comandos inalterada desde o último sync. Sincronização pulada.")
+    except Exception as e:
+        log.error(f"[!] Erro ao sincronizar comandos de slash: {e}")
+
+async def report_startup(background):
+    await bot.wait_until_ready()
+    await asyncio.gather(*background, return_exceptions=True)
+    log.info(f"🚀 Inicialização concluída: {startup.summary()}")
+
+# -----------------------------
+# Eleição de líder
+# -----------------------------
+async def start_leader_election(database_ready):
+    # As cogs reagem ao evento leadership_change; os canais precisam estar em cache
+    # e as coleções/índices criados (a líder grava logs, estado e updates) antes
+    await asyncio.gather(bot.wait_until_ready(), asyncio.shield(database_ready))
+    bot.lease.start()
 
 # -----------------------------
 # Evento on_ready
 # -----------------------------
 @bot.event
 async def on_ready():
-    global slash_synced
-    if not slash_synced:
-        print("⏳ Sincronizando comandos de slash...")
-        try:
-            await bot.tree.sync()
-            print("✅ Comandos de slash sincronizados!")
-        except Exception as e:
-            print(f"[!] Erro ao sincronizar comandos de slash: {e}")
-        slash_synced = True
-    print(f"✅ Bot {bot.user} está online!")
+    startup.end("gateway")
+    log.info(f"✅ Bot {bot.user} está online!")
 
 # -----------------------------
 # Função principal
 # -----------------------------
 async def main():
-    await load_cogs()
-    await init_database()
-    print("⏳ Conectando o bot...")
-    await bot.start(os.getenv("DISCORD_TOKEN"))
+    # Cliente HTTP e camada de dados compartilhados por todas as cogs (um pool de conexões cada)
+    bot.http_client = HttpClient()
+    bot.db = Database()
+    bot.profiler = None
+    if PROFILE:
+        bot.profiler = LoopProfiler(threshold=PROFILE_SLOW_CALLBACK_MS / 1000)
+        bot.profiler.start()
+    bot.lease = LeaderLease(
+        bot.db.collection("leases"),
+        "background-tasks",
+        owner=LEADER_ID,
+        ttl=LEADER_LEASE_TTL,
+        on_change=lambda leader: bot.dispatch("leadership_change", leader),
+        enabled=LEADER_ELECTION,
+    )
+    # SIGTERM (docker stop) fecha o bot de forma ordenada, descarregando as cogs
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(bot.close()))
+    except NotImplementedError:
+        pass
+
+    # Tasks em segundo plano da inicialização, canceladas no encerramento
+    startup_tasks = []
+    try:
+        async with bot:
+            with startup.phase("cogs"):
+                await load_cogs()
+
+            # O bootstrap do MongoDB e o sync de comandos correm em paralelo com a conexão ao gateway
+            database_ready = asyncio.create_task(init_database(), name="startup-db")
+            background = [database_ready]
+            startup_tasks.append(database_ready)
+            log.info("⏳ Conectando o bot...")
+            with startup.phase("login"):
+                await bot.login(os.getenv("DISCORD_TOKEN"))
+            background.append(asyncio.create_task(sync_commands(), name="startup-sync"))
+            startup_tasks.append(background[-1])
+            startup_tasks.append(asyncio.create_task(report_startup(background), name="startup-report"))
+            startup_tasks.append(asyncio.create_task(start_leader_election(database_ready), name="leader-election"))
+
+            startup.begin("gateway")
+            await bot.connect()
+    finally:
+        # Bootstrap/sync ainda em andamento (login ou conexão falhou) param antes de fechar os clientes
+        for task in startup_tasks:
+            task.cancel()
+        await asyncio.gather(*startup_tasks, return_exceptions=True)
+        # As cogs já foram descarregadas (estado gravado); a próxima réplica assume sem esperar o lease expirar
+        await bot.lease.release()
+        if bot.profiler:
+            await bot.profiler.stop()
+        await bot.http_client.close()
+        bot.db.close()
+        log.info("🔌 Cliente HTTP e conexão com o MongoDB encerrados.")
+        # Por último: esvazia a fila de logs (a thread do listener é daemon e morreria com registros pendentes)
+        log_listener.stop()
 
 # -----------------------------
 # Entry point
@@ -1,7 +1,8 @@
-import aiohttp
 from datetime import datetime
+import hashlib
 import pytz
-import time
+
+from core.http import RequestTimings
 
 # Fuso horário do Brasil
 BR_TZ = pytz.timezone("America/Sao_Paulo")
@@ -27,31 +28,57 @@ def ms_to_str(ms: float) -> str:
     h, m = divmod(m, 60)
     return f"{h}h {m:02d}m {s:02d}s"
 
-async def get_site_status(url: str) -> dict:
+def content_hash(title: str, description: str) -> str:
+    """Hash do conteúdo normalizado (minúsculas, espaços colapsados) de um anúncio"""
+    normalized = "\n".join(" ".join((text or "").lower().split()) for text in (title, description))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+async def drain(response, max_bytes: int) -> bool:
+    """
+    Lê e descarta o corpo da resposta para a conexão voltar ao pool; sem isso o
+    aiohttp a fecha na liberação. Corpos maiores que `max_bytes` (ou um erro de
+    leitura) são abandonados e a conexão é fechada. Retorna True se leu tudo.
+    """
+    read = 0
+    try:
+        async for chunk in response.content.iter_chunked(65536):
+            read += len(chunk)
+            if read > max_bytes:
+                return False
+    except Exception:
+        return False
+    return True
+
+async def get_site_status(http, url: str, max_body: int = 1 << 20) -> dict:
     """
-    Faz requisição HTTP ao site e retorna dicionário com status
-    {'online': bool, 'http_code': int, 'response_time': int, 'timestamp': datetime}
+    Faz requisição HTTP ao site usando o cliente compartilhado e retorna dicionário com status
+    {'online': bool, 'http_code': int, 'response_time': int, 'connect_time': int, 'ttfb': int, 'timestamp': datetime}
+    response_time é o total; connect_time (DNS/TCP/TLS) e ttfb (tempo até o primeiro byte) o decompõem.
+    Os tempos vão até os headers; o corpo (até `max_body` bytes) é só drenado para reaproveitar a conexão.
     """
-    start_time = time.time()
-    timeout = aiohttp.ClientTimeout(total=10)
-
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        try:
-            async with session.get(url) as response:
-                response_time = int((time.time() - start_time) * 1000)
-                code = response.status
-                online = 200 <= code < 300
-                return {
-                    "online": online,
-                    "http_code": code,
-                    "response_time": response_time,
-                    "timestamp": now()
-                }
-        except Exception as e:
-            return {
-                "online": False,
-                "http_code": None,
-                "response_time": 0,
-                "timestamp": now(),
-                "error": str(e)
-            }
\ No newline at end of file
+    timings = RequestTimings()
+
+    try:
+        async with http.get(url, timings=timings) as response:
+            code = response.status
+            online = 200 <= code < 300
+            result = {
+                "online": online,
+                "http_code": code,
+                "response_time": timings.total,
+                "connect_time": timings.connect,
+                "ttfb": timings.ttfb,
+                "timestamp": now()
+            }
+            await drain(response, max_body)
+            return result
+    except Exception as e:
+        return {
+            "online": False,
+            "http_code": None,
+            "response_time": 0,
+            "connect_time": 0,
+            "ttfb": 0,
+            "timestamp": now(),
+            "error": str(e)
+        }